@@ -0,0 +1,149 @@
+#!/usr/bin/python3
+
+"""
+Copyright 2024 X Allegretta.
+
+This file is part of py3_bricksmasher.
+py3_bricksmasher is free software: you can redistribute it and/or modify it under the terms
+of the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+py3_bricksmasher is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+You should have received a copy of the GNU Lesser General Public License along with py3_bricksmasher.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# loads every image once and gets it ready to draw.
+
+import collections
+import concurrent.futures
+import os
+os.environ['PYGAME_HIDE_SUPPORT_PROMPT']="bluh." # disable pygame's welcome message.
+import pygame
+from tint import *
+
+class Assets:
+  # scale is how big to make every image, compared to its file.
+  # images are scaled once when they are loaded, so drawing them costs the same at any size.
+  def __init__(self, path : str = "bmps", scale : float = 1.0):
+    self.path = path
+    self.scale = scale
+    self.images = {} # loaded images, stored by file name (without ".bmp")
+    self.bricks = collections.OrderedDict() # baked bricks, stored by (inner hue, glow hue)
+    self.bricks_size = 32 # how many baked bricks to keep
+    # backgrounds are big, so only a few are kept, and they are loaded as they are needed
+    self.backgrounds = collections.OrderedDict() # converted backgrounds, stored by number
+    self.backgrounds_size = 3 # the current level's, the next level's, and one more for going back to the first level
+    self.background_count = 0 # how many backgrounds there are (background1.bmp, background2.bmp, ...)
+    while os.path.exists(os.path.join(path, "background" + str(self.background_count+1) + ".bmp")):
+      self.background_count += 1
+    self.loading = {} # backgrounds being loaded on the worker thread, stored by number
+    self.worker = None # thread for loading backgrounds ahead of time, started the first time it's needed
+    self.brick_inner_tints = TintCache(self.image("brick_inner"))
+    self.brick_glow_tints = TintCache(self.image("brick_glow"))
+    # ball, plus rotated copies
+    self.ball = [self.image("ball")]
+    for i in range(1,4):
+      self.ball.append(pygame.transform.rotate(self.ball[i-1], 90))
+
+  # load an image, converted to the same pixel format as the window.
+  # if there's no window yet, the image is left as it was loaded.
+  def image(self, name : str, alpha : bool = True) -> pygame.Surface:
+    surf = self.images.get(name)
+    if surf is None:
+      surf = pygame.image.load(os.path.join(self.path, name + ".bmp"))
+      if pygame.display.get_surface() is not None:
+        surf = surf.convert_alpha() if alpha else surf.convert()
+      surf = self.scaled(surf)
+      self.images[name] = surf
+    return surf
+
+  def scaled(self, surf : pygame.Surface) -> pygame.Surface:
+    if self.scale == 1:
+      return surf
+    size = (round(surf.get_width()*self.scale), round(surf.get_height()*self.scale))
+    # smoothscale only works on 24 and 32 bit images
+    if surf.get_bitsize() >= 24:
+      return pygame.transform.smoothscale(surf, size)
+    return pygame.transform.scale(surf, size)
+
+  # the background for a level. there can be more levels than backgrounds, so they are reused.
+  def background(self, level : int) -> pygame.Surface:
+    number = (level-1) % self.background_count + 1
+    surf = self.backgrounds.get(number)
+    if surf is not None:
+      self.backgrounds.move_to_end(number)
+      return surf
+    future = self.loading.pop(number, None)
+    if future is not None:
+      surf = future.result() # usually finished already
+    else:
+      surf = self.load_background(number)
+    self.backgrounds[number] = surf
+    if len(self.backgrounds) > self.backgrounds_size:
+      self.backgrounds.popitem(False)
+    return surf
+
+  # start loading a level's background on the worker thread, so it's ready by the time it's needed
+  def prefetch_background(self, level : int):
+    number = (level-1) % self.background_count + 1
+    if number in self.backgrounds or number in self.loading:
+      return
+    if self.worker is None:
+      self.worker = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="assets")
+    self.loading[number] = self.worker.submit(self.load_background, number)
+
+  # stop the worker thread, waiting for a background it's already loading.
+  # has to be called before pygame.quit(), so nothing is loaded after pygame is gone.
+  def close(self):
+    if self.worker is not None:
+      self.worker.shutdown(cancel_futures=True)
+      self.worker = None
+    self.loading.clear()
+
+  # backgrounds don't need transparency, so they are converted without it.
+  # this runs on the worker thread, so it can't touch anything else in Assets.
+  def load_background(self, number : int) -> pygame.Surface:
+    surf = pygame.image.load(os.path.join(self.path, "background" + str(number) + ".bmp"))
+    if pygame.display.get_surface() is not None:
+      surf = surf.convert()
+    return self.scaled(surf)
+
+  def paddle(self, index : int) -> pygame.Surface:
+    return self.image("paddle" + str(index+1))
+
+  # get one brick image with the inner, frame and glow layers already combined.
+  # the image is premultiplied, so it must be drawn with pygame.BLEND_PREMULTIPLIED.
+  def brick(self, inner_hue : int, glow_hue : int) -> pygame.Surface:
+    key = (inner_hue, glow_hue)
+    surf = self.bricks.get(key)
+    if surf is None:
+      layers = (self.brick_inner_tints.get(hue_color(inner_hue)), self.image("brick_frame"), self.brick_glow_tints.get(hue_color(glow_hue)))
+      surf = pygame.Surface(layers[0].get_size(), pygame.SRCALPHA)
+      surf.fill((0, 0, 0, 0))
+      # stacking premultiplied layers gives the same result as drawing them one after another
+      for layer in layers:
+        surf.blit(layer.premul_alpha(), (0, 0), special_flags=pygame.BLEND_PREMULTIPLIED)
+      self.bricks[key] = surf
+      if len(self.bricks) > self.bricks_size:
+        self.bricks.popitem(False)
+    else:
+      self.bricks.move_to_end(key)
+    return surf
+
+# assets that have been loaded, stored by (path, scale), so going back to a resolution doesn't build everything again
+loaded = {}
+
+# get the assets for a scale, loading them the first time they're asked for
+def load_assets(path : str = "bmps", scale : float = 1.0) -> Assets:
+  assets = loaded.get((path, scale))
+  if assets is None:
+    assets = Assets(path, scale)
+    loaded[(path, scale)] = assets
+  return assets
+
+# stop the worker threads of every set of assets that has been loaded
+def close_assets():
+  for assets in loaded.values():
+    assets.close()
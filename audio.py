@@ -0,0 +1,113 @@
+#!/usr/bin/python3
+
+"""
+Copyright 2024 X Allegretta.
+
+This file is part of py3_bricksmasher.
+py3_bricksmasher is free software: you can redistribute it and/or modify it under the terms
+of the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+py3_bricksmasher is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+You should have received a copy of the GNU Lesser General Public License along with py3_bricksmasher.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# plays sound effects with as little delay as possible.
+# the mixer is opened with a small buffer, sounds are played on a fixed pool of channels,
+# and the same sound played again within a short window is skipped instead of piling up.
+
+import time as _time
+import os
+os.environ['PYGAME_HIDE_SUPPORT_PROMPT']="bluh." # disable pygame's welcome message.
+import pygame
+
+class Audio:
+  # this has to be made before pygame.init(), so that the mixer is opened with these settings.
+  # buffer is the mixer's buffer size in samples. smaller is less delay, but can crackle on slow machines.
+  # voices is how many channels are kept for sound effects.
+  # window is how long (in seconds) to skip a sound for after it's played.
+  def __init__(self, buffer : int = 256, frequency : int = 44100, voices : int = 8, window : float = 0.03):
+    self.buffer = buffer
+    self.voices = voices
+    self.window = window
+    self.enabled = False # whether or not the mixer could be opened
+    self.sounds = {} # loaded sounds, stored by name
+    self.last = {} # when each sound was last played
+    self.channels = [] # the channels in the pool
+    self.started = [] # when each channel in the pool was last started
+    # how long the requested buffer takes to play, in seconds. SDL can use a different buffer than was asked for,
+    # and pygame can't say what it got, so this is only an estimate.
+    self.output_latency = 0.0
+    # stats
+    self.played = 0
+    self.skipped = 0 # sounds skipped because they were played too recently
+    self.stolen = 0 # sounds cut off because every channel was busy
+    self.play_time = 0.0 # total time spent starting sounds
+    self.play_time_max = 0.0
+    pygame.mixer.pre_init(frequency, -16, 2, buffer)
+
+  # set up the channel pool. call this after pygame.init().
+  def start(self):
+    init = pygame.mixer.get_init()
+    if init is None:
+      # no audio device. sounds are silently skipped.
+      return
+    self.enabled = True
+    frequency = init[0]
+    self.output_latency = self.buffer/frequency
+    if pygame.mixer.get_num_channels() < self.voices:
+      pygame.mixer.set_num_channels(self.voices)
+    # keep the pool's channels for sound effects, so nothing else can take them
+    pygame.mixer.set_reserved(self.voices)
+    self.channels = [pygame.mixer.Channel(i) for i in range(self.voices)]
+    self.started = [0.0]*self.voices
+
+  def load(self, name : str, filename : str):
+    if self.enabled:
+      self.sounds[name] = pygame.mixer.Sound(filename)
+
+  # play a sound, unless it was played less than window seconds ago.
+  # returns True if it was played.
+  def play(self, name : str) -> bool:
+    if not self.enabled:
+      return False
+    now = _time.perf_counter()
+    if now - self.last.get(name, -self.window) < self.window:
+      self.skipped += 1
+      return False
+    self.last[name] = now
+    # use a free channel, or cut off the one that has been playing the longest
+    index = -1
+    for i in range(self.voices):
+      if not self.channels[i].get_busy():
+        index = i
+        break
+    if index < 0:
+      index = self.started.index(min(self.started))
+      self.stolen += 1
+    self.channels[index].play(self.sounds[name])
+    self.started[index] = now
+    # time from the sound being asked for to it being handed to the mixer
+    elapsed = _time.perf_counter() - now
+    self.played += 1
+    self.play_time += elapsed
+    self.play_time_max = max(self.play_time_max, elapsed)
+    return True
+
+  # about how long it takes from play() being called to the sound coming out, on average, in seconds.
+  # this is the time spent starting the sound plus the time for the requested buffer to play.
+  def latency(self) -> float:
+    if self.played == 0:
+      return self.output_latency
+    return self.play_time/self.played + self.output_latency
+
+  # a few lines about how sounds have been played, for the profiler's overlay
+  def report(self) -> str:
+    if not self.enabled:
+      return "audio: off"
+    return "\n".join([
+      "audio latency: ~{:.2f}ms (requested buffer {:.2f}ms)".format(self.latency()*1000, self.output_latency*1000),
+      "sounds: {} played {} skipped {} cut off".format(self.played, self.skipped, self.stolen),
+    ])
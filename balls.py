@@ -0,0 +1,184 @@
+#!/usr/bin/python3
+
+"""
+Copyright 2024 X Allegretta.
+
+This file is part of py3_bricksmasher.
+py3_bricksmasher is free software: you can redistribute it and/or modify it under the terms
+of the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+py3_bricksmasher is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+You should have received a copy of the GNU Lesser General Public License along with py3_bricksmasher.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# extra balls for multi-ball mode, moved all at once with numpy.
+# each ball follows the same rules as the game's ball in Game.move_ball(), but losing one costs nothing.
+# usage: python3 balls.py [balls] [ticks]
+
+import sys
+import time as _time
+import numpy as np
+from game import *
+
+# how fast new balls can go. the same speeds the ball can get from the paddle.
+SPAWN_SPEED_X = (-3, -2, -1, 1, 2, 3)
+SPAWN_SPEED_Y = (-1, -2, -3)
+
+class BallSet:
+  def __init__(self):
+    # one entry per ball
+    i32 = np.int32
+    self.x = np.zeros(0, i32)
+    self.y = np.zeros(0, i32)
+    self.speed_x = np.zeros(0, i32)
+    self.speed_y = np.zeros(0, i32)
+
+  def __len__(self) -> int:
+    return len(self.x)
+
+  def clear(self):
+    self.x = self.x[:0]
+    self.y = self.y[:0]
+    self.speed_x = self.speed_x[:0]
+    self.speed_y = self.speed_y[:0]
+
+  # add count balls somewhere above the paddle, going up at random speeds from game's random numbers
+  def spawn(self, game : Game, count : int):
+    w = PADDLE_W[game.paddle_index]
+    x = [game.paddle_x + game.randrange(w - BALL_SIZE + 1) for i in range(count)]
+    y = [game.paddle_y - BALL_SIZE - game.randrange(240) for i in range(count)]
+    speed_x = [game.choice(SPAWN_SPEED_X) for i in range(count)]
+    speed_y = [game.choice(SPAWN_SPEED_Y) for i in range(count)]
+    self.x = np.concatenate((self.x, np.array(x, np.int32)))
+    self.y = np.concatenate((self.y, np.array(y, np.int32)))
+    self.speed_x = np.concatenate((self.speed_x, np.array(speed_x, np.int32)))
+    self.speed_y = np.concatenate((self.speed_y, np.array(speed_y, np.int32)))
+
+  # find the first brick (in row order) that each ball touches, like BrickField.find().
+  # the bricks are a uniform grid, so only the cells under each ball are checked. a ball is smaller
+  # than a brick, so it can only be over 2 rows and 2 columns at most.
+  # returns the index of the brick for each ball, or -1 for balls that don't touch one.
+  def find_bricks(self, game : Game) -> np.ndarray:
+    bricks = game.bricks
+    found = np.full(len(self.x), -1, np.int64)
+    # only balls that reach the rows of bricks need checking
+    near = np.nonzero(self.y < bricks.row_y(bricks.rows))[0]
+    if len(near) == 0:
+      return found
+    x = self.x[near]
+    y = self.y[near]
+    pitch_y = bricks.h + bricks.gap
+    pitch_x = bricks.w + bricks.gap
+    field = np.frombuffer(bricks.bricks, np.uint8)
+    first_row = (y - bricks.y - bricks.h)//pitch_y + 1
+    last_row = (y + BALL_SIZE - bricks.y - 1)//pitch_y
+    hit = np.full(len(near), -1, np.int64)
+    # check the cells from last to first, so the first brick in row order wins
+    for dr in (1, 0):
+      row = first_row + dr
+      row_ok = (row >= 0) & (row <= last_row) & (row < bricks.rows)
+      row_x = bricks.x + game.row_offset*((row%2)*2-1)
+      first_col = (x - row_x - bricks.w)//pitch_x + 1
+      last_col = (x + BALL_SIZE - row_x - 1)//pitch_x
+      for dc in (1, 0):
+        col = first_col + dc
+        ok = row_ok & (col >= 0) & (col <= last_col) & (col < bricks.cols)
+        index = np.where(ok, row*bricks.cols + col, 0)
+        ok &= field[index] != 0
+        hit = np.where(ok, index, hit)
+    found[near] = hit
+    return found
+
+  # hit the bricks found by find_bricks().
+  # returns which balls hit one, where the bricks are, and how many bricks were hit.
+  def hit_bricks(self, game : Game, found : np.ndarray):
+    bricks = game.bricks
+    hit = found >= 0
+    row = np.where(hit, found//bricks.cols, 0)
+    col = found%bricks.cols
+    hit_x = bricks.x + game.row_offset*((row%2)*2-1) + col*(bricks.w + bricks.gap)
+    hit_y = bricks.y + row*(bricks.h + bricks.gap)
+    # balls that hit the same brick at once all bounce, but only take one hit off of it (and score once)
+    indices = set(found[hit].tolist())
+    for index in indices:
+      bricks.hit(index)
+    return hit, hit_x, hit_y, len(indices)
+
+  # move every ball one tick. returns how many bricks were hit.
+  def move(self, game : Game) -> int:
+    if len(self.x) == 0:
+      return 0
+    width = game.width
+    # --- x-axis ---
+    self.x += self.speed_x
+    hit, hit_x, hit_y, hits = self.hit_bricks(game, self.find_bricks(game))
+    self.x = np.where(hit, np.where(self.speed_x < 0, hit_x + BRICK_W, hit_x - BALL_SIZE), self.x)
+    self.speed_x = np.where(hit, -self.speed_x, self.speed_x)
+    # screen borders
+    wall = (self.x < 0) | (self.x > width - BALL_SIZE)
+    np.clip(self.x, 0, width - BALL_SIZE, out=self.x)
+    self.speed_x = np.where(wall, -self.speed_x, self.speed_x)
+
+    # --- y-axis ---
+    self.y += self.speed_y
+    hit, hit_x, hit_y, count = self.hit_bricks(game, self.find_bricks(game))
+    hits += count
+    self.y = np.where(hit, np.where(self.speed_y < 0, hit_y + BRICK_H, hit_y - BALL_SIZE), self.y)
+    self.speed_y = np.where(hit, -self.speed_y, self.speed_y)
+
+    # paddle. only balls at the bottom of the screen can touch it.
+    w = PADDLE_W[game.paddle_index]
+    pad = (self.y + BALL_SIZE > game.paddle_y) & (self.y < game.paddle_y + PADDLE_H) \
+      & (self.x + BALL_SIZE > game.paddle_x) & (self.x < game.paddle_x + w)
+    if pad.any():
+      self.y = np.where(pad, game.paddle_y - BALL_SIZE, self.y)
+      # same as Game.paddle_bounce()
+      ball_dist = self.x + BALL_SIZE/2 - (game.paddle_x + w/2)
+      dist = np.abs(ball_dist)
+      center = dist <= w/6
+      middle = ~center & (dist <= w*(3.0/8.0))
+      sign_x = np.where(self.speed_x > 0, 1, -1)
+      new_x = np.where(center, sign_x, np.where(middle, 2*sign_x, np.where(ball_dist > 0, 3, -3)))
+      new_y = np.where(center, -3, np.where(middle, -2, -1))
+      self.speed_x = np.where(pad, new_x, self.speed_x).astype(np.int32)
+      self.speed_y = np.where(pad, new_y, self.speed_y).astype(np.int32)
+
+    # top of screen
+    top = self.y < 0
+    self.y = np.where(top, 0, self.y)
+    self.speed_y = np.where(top, -self.speed_y, self.speed_y)
+    # balls that fall off the bottom are gone
+    lost = self.y > game.height + 2*BALL_SIZE
+    if lost.any():
+      keep = ~lost
+      self.x = self.x[keep]
+      self.y = self.y[keep]
+      self.speed_x = self.speed_x[keep]
+      self.speed_y = self.speed_y[keep]
+    if hits > 0 or pad.any() or wall.any() or top.any():
+      game.events |= Game_Enum.BOUNCE
+    return hits
+
+# run a headless multi-ball game and print how fast it went
+def main():
+  count = 1000
+  ticks = 100000
+  if len(sys.argv) > 1:
+    count = int(sys.argv[1])
+  if len(sys.argv) > 2:
+    ticks = int(sys.argv[2])
+  game = Game(0, False, None, count)
+  start = _time.perf_counter()
+  most = 0
+  for i in range(ticks):
+    game.step(track_ball(game), game.ball_new)
+    most = max(most, len(game.balls))
+  elapsed = _time.perf_counter() - start
+  print("{} ticks in {:.3f}s ({:.0f} ticks/s), up to {} balls at once".format(ticks, elapsed, ticks/elapsed, most+1))
+  print("level: {} lives: {} score: {}".format(game.level, game.lives, game.score))
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,274 @@
+#!/usr/bin/python3
+
+"""
+Copyright 2024 X Allegretta.
+
+This file is part of py3_bricksmasher.
+py3_bricksmasher is free software: you can redistribute it and/or modify it under the terms
+of the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+py3_bricksmasher is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+You should have received a copy of the GNU Lesser General Public License along with py3_bricksmasher.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# runs many games at once, in lockstep, using numpy.
+# the rules are the same as Game.step() in game.py, but every variable holds one value per game.
+# brick colors are not simulated, since they don't change how the game plays.
+
+import sys
+import time as _time
+import numpy as np
+from game import *
+
+# x offset of each column and y position of each row of bricks
+COL_X = np.arange(BRICK_COLS, dtype=np.int32) * (BRICK_W+BRICK_GAP)
+ROW_Y = BRICK_Y + np.arange(BRICK_ROWS, dtype=np.int32) * (BRICK_H+BRICK_GAP)
+# which rows are alternately moved left and right by row_offset
+ROW_SIGN = (np.arange(BRICK_ROWS, dtype=np.int32)%2)*2-1
+PADDLE_WIDTHS = np.array(PADDLE_W, dtype=np.int32)
+
+class BatchGame:
+  def __init__(self, n : int):
+    self.n = n
+    self.width = WIN_W
+    self.height = WIN_H
+    i32 = np.int32
+    self.time = np.zeros(n, i32)
+    self.ticks = 0
+    # paddle
+    self.paddle_index = np.zeros(n, i32)
+    self.paddle_x = np.full(n, self.width//2 - PADDLE_W[0]//2, i32)
+    self.paddle_y = self.height - PADDLE_H - 4
+    # ball
+    self.ball_x = np.full(n, self.width//2 - BALL_SIZE//2, i32)
+    self.ball_y = np.full(n, self.height - 74, i32)
+    self.ball_new = np.ones(n, bool)
+    self.ball_speed_x = np.full(n, 2, i32)
+    self.ball_speed_y = np.full(n, -2, i32)
+    # bricks
+    self.rows = np.full(n, 2, i32)
+    self.row_offset = np.zeros(n, i32)
+    self.row_offset_max = np.zeros(n, i32)
+    self.row_offset_add = np.zeros(n, i32)
+    self.brick_count = np.full(n, 2*BRICK_COLS, i32)
+    # only rows that are in play are filled, so rows beyond self.rows never need checking.
+    self.bricks = np.zeros((n, BRICK_ROWS, BRICK_COLS), bool)
+    self.bricks[:, :2] = True
+    # counters
+    self.level = np.ones(n, i32)
+    self.lives = np.full(n, 3, i32)
+    self.score = np.zeros(n, i32)
+    self.events = np.zeros(n, i32)
+
+  # put a fresh game in every slot selected by mask
+  def reset(self, mask : np.ndarray = None):
+    if mask is None:
+      mask = np.ones(self.n, bool)
+    fresh = BatchGame(1)
+    for name, value in vars(fresh).items():
+      if isinstance(value, np.ndarray):
+        getattr(self, name)[mask] = value[0]
+
+  # fill the rows that are in play for the selected games
+  def reset_bricks(self, mask : np.ndarray):
+    self.bricks[mask] = np.arange(BRICK_ROWS)[None, :, None] < self.rows[mask][:, None, None]
+    self.brick_count[mask] = BRICK_COLS*self.rows[mask]
+
+  def move_paddle(self, x : np.ndarray, mask : np.ndarray):
+    w = PADDLE_WIDTHS[self.paddle_index]
+    new_x = np.clip(x.astype(np.int32) - w//2, 0, self.width - w)
+    self.paddle_x = np.where(mask, new_x, self.paddle_x)
+
+  def set_paddle(self, index : int, mask : np.ndarray):
+    center = self.paddle_x + PADDLE_WIDTHS[self.paddle_index]//2
+    mask = mask & (self.paddle_index != index)
+    self.paddle_index = np.where(mask, index, self.paddle_index)
+    self.move_paddle(center, mask)
+
+  def reset_ball(self, mask : np.ndarray):
+    self.ball_new |= mask
+    self.ball_x = np.where(mask, self.paddle_x + PADDLE_WIDTHS[self.paddle_index]//2 - BALL_SIZE//2, self.ball_x)
+    self.ball_y = np.where(mask, self.paddle_y - BALL_SIZE, self.ball_y)
+
+  # check for collisions between the ball and the bricks in every game selected by active.
+  # like Game.brick_col(), only the first brick in row order is removed.
+  # returns which games hit a brick, and the position of the brick that was hit.
+  def brick_col(self, active : np.ndarray):
+    n = self.n
+    row_x = BRICK_X + self.row_offset[:, None]*ROW_SIGN[None, :] # (n, rows)
+    over_y = (ROW_Y[None, :] < (self.ball_y + BALL_SIZE)[:, None]) & (self.ball_y[:, None] < ROW_Y[None, :] + BRICK_H)
+    left = row_x[:, :, None] + COL_X[None, None, :] # (n, rows, cols)
+    bx = self.ball_x[:, None, None]
+    over_x = (left < bx + BALL_SIZE) & (bx < left + BRICK_W)
+    hits = (self.bricks & over_x & (over_y & active[:, None])[:, :, None]).reshape(n, -1)
+    hit = hits.any(axis=1)
+    first = hits.argmax(axis=1)
+    row = first // BRICK_COLS
+    col = first % BRICK_COLS
+    games = np.nonzero(hit)[0]
+    self.bricks[games, row[games], col[games]] = False
+    self.brick_count -= hit
+    hit_x = row_x[np.arange(n), row] + COL_X[col]
+    hit_y = ROW_Y[row]
+    return hit, hit_x, hit_y
+
+  # advance every game by one tick. see Game.step().
+  # paddle_x holds the paddle center for each game, or is None if no paddle moved.
+  # launch is a bool per game, or a single bool for all of them.
+  # returns an array of Game_Enum flags, one per game.
+  def step(self, paddle_x = None, launch = False) -> np.ndarray:
+    events = np.zeros(self.n, np.int32)
+    launch = np.broadcast_to(np.asarray(launch, bool), (self.n,))
+
+    # --- paddle ---
+    if paddle_x is not None:
+      paddle_x = np.broadcast_to(np.asarray(paddle_x), (self.n,))
+      self.move_paddle(paddle_x, np.ones(self.n, bool))
+      # keep a new ball stuck to paddle
+      stuck = self.ball_new
+      self.ball_x = np.where(stuck, self.paddle_x + PADDLE_WIDTHS[self.paddle_index]//2 - BALL_SIZE//2, self.ball_x)
+      # launch ball
+      go = stuck & launch
+      self.ball_new = stuck & ~go
+      self.ball_speed_y = np.where(go, -2, self.ball_speed_y)
+      self.ball_speed_x = np.where(go, np.where(paddle_x > self.width/2, -2, 2), self.ball_speed_x)
+
+    # --- ball movement + collision ---
+    moving = ~self.ball_new & (self.time%(self.level+2) != 0)
+    if moving.any():
+      events |= self.move_ball(moving)
+
+    self.time = (self.time+1) % (3*4*5*7)
+    self.ticks += 1
+    # decide when to move rows
+    rows_move = self.level > 2
+    if rows_move.any():
+      off_max = np.where(rows_move, self.row_offset_max, 1)
+      period = 8-self.level + (10*np.abs(self.row_offset)//off_max)
+      period = np.where(rows_move, period, 1)
+      rows_move &= self.time%period == 0
+      flip = rows_move & (np.abs(self.row_offset) == self.row_offset_max)
+      self.row_offset_add = np.where(flip, -self.row_offset_add, self.row_offset_add)
+      self.row_offset = np.where(rows_move, self.row_offset + self.row_offset_add, self.row_offset)
+
+    self.events = events
+    return events
+
+  def move_ball(self, moving : np.ndarray) -> np.ndarray:
+    events = np.zeros(self.n, np.int32)
+    bounce = np.zeros(self.n, bool)
+
+    # --- x-axis ---
+    self.ball_x = np.where(moving, self.ball_x + self.ball_speed_x, self.ball_x)
+    hit, hit_x, hit_y = self.brick_col(moving)
+    update_score = hit
+    bounce |= hit
+    self.ball_x = np.where(hit, np.where(self.ball_speed_x < 0, hit_x + BRICK_W, hit_x - BALL_SIZE), self.ball_x)
+    self.ball_speed_x = np.where(hit, -self.ball_speed_x, self.ball_speed_x)
+    # screen borders
+    wall = moving & ((self.ball_x < 0) | (self.ball_x > self.width - BALL_SIZE))
+    bounce |= wall
+    self.ball_x = np.where(moving, np.clip(self.ball_x, 0, self.width - BALL_SIZE), self.ball_x)
+    self.ball_speed_x = np.where(wall, -self.ball_speed_x, self.ball_speed_x)
+
+    # --- y-axis ---
+    self.ball_y = np.where(moving, self.ball_y + self.ball_speed_y, self.ball_y)
+    hit, hit_x, hit_y = self.brick_col(moving)
+    update_score = update_score | hit
+    bounce |= hit
+    self.ball_y = np.where(hit, np.where(self.ball_speed_y < 0, hit_y + BRICK_H, hit_y - BALL_SIZE), self.ball_y)
+    self.ball_speed_y = np.where(hit, -self.ball_speed_y, self.ball_speed_y)
+
+    # paddle collision
+    w = PADDLE_WIDTHS[self.paddle_index]
+    pad = moving & (self.paddle_x < self.ball_x + BALL_SIZE) & (self.ball_x < self.paddle_x + w) \
+      & (self.paddle_y < self.ball_y + BALL_SIZE) & (self.ball_y < self.paddle_y + PADDLE_H)
+    bounce |= pad
+    self.ball_y = np.where(pad, self.paddle_y - BALL_SIZE, self.ball_y)
+    ball_dist = self.ball_x + BALL_SIZE/2 - (self.paddle_x + w/2)
+    dist = np.abs(ball_dist)
+    center = dist <= w/6
+    middle = ~center & (dist <= w*(3.0/8.0))
+    sign_x = np.where(self.ball_speed_x > 0, 1, -1)
+    new_x = np.where(center, sign_x, np.where(middle, 2*sign_x, np.where(ball_dist > 0, 3, -3)))
+    new_y = np.where(center, -3, np.where(middle, -2, -1))
+    self.ball_speed_x = np.where(pad, new_x, self.ball_speed_x)
+    self.ball_speed_y = np.where(pad, new_y, self.ball_speed_y)
+
+    # top of screen
+    top = moving & (self.ball_y < 0)
+    bounce |= top
+    self.ball_y = np.where(top, 0, self.ball_y)
+    self.ball_speed_y = np.where(top, -self.ball_speed_y, self.ball_speed_y)
+    # bottom
+    lost = moving & ~top & (self.ball_y > self.height + 2*BALL_SIZE)
+    if lost.any():
+      events |= np.where(lost, Game_Enum.LIVES, 0)
+      self.lives -= lost
+      over = lost & (self.lives == -1)
+      if over.any():
+        events |= np.where(over, Game_Enum.GAME_OVER | Game_Enum.LEVEL | Game_Enum.SCORE | Game_Enum.COLORS, 0)
+        self.row_offset[over] = 0
+        self.row_offset_max[over] = 0
+        self.level[over] = 1
+        self.score[over] = 0
+        self.lives[over] = 3
+        self.rows[over] = 2
+        self.reset_bricks(over)
+        self.set_paddle(0, over)
+      self.reset_ball(lost)
+
+    events |= np.where(bounce, Game_Enum.BOUNCE, 0)
+
+    # update score
+    if update_score.any():
+      events |= np.where(update_score, Game_Enum.SCORE, 0)
+      self.score += 10*update_score
+      won = update_score & (self.brick_count == 0)
+      if won.any():
+        events |= self.next_level(won)
+    return events
+
+  def next_level(self, won : np.ndarray) -> np.ndarray:
+    self.level += won
+    beat_game = won & (self.level == 7)
+    events = np.where(won, Game_Enum.LEVEL | Game_Enum.LIVES | Game_Enum.COLORS, 0)
+    events |= np.where(beat_game, Game_Enum.GAME_WON, np.where(won, Game_Enum.LEVEL_BEATEN, 0))
+    if beat_game.any():
+      self.rows[beat_game] = 1
+      self.lives[beat_game] += 3
+      self.level[beat_game] = 1
+      self.set_paddle(0, beat_game)
+    # decrease paddle size, add lives on certain levels
+    self.set_paddle(1, won & (self.level == 4))
+    self.lives += won & (self.level == 6)
+    self.reset_ball(won)
+    self.rows = np.where(won & (self.rows < BRICK_ROWS), self.rows+1, self.rows)
+    self.row_offset_add = np.where(won, self.level-2, self.row_offset_add)
+    self.row_offset_max = np.where(won, self.row_offset_add*40, self.row_offset_max)
+    self.row_offset = np.where(won, 0, self.row_offset)
+    self.reset_bricks(won)
+    return events
+
+# run a batch of headless games and print how fast it went
+def main():
+  n = 10000
+  steps = 1000
+  if len(sys.argv) > 1:
+    n = int(sys.argv[1])
+  if len(sys.argv) > 2:
+    steps = int(sys.argv[2])
+  games = BatchGame(n)
+  start = _time.perf_counter()
+  for i in range(steps):
+    # keep every paddle under its ball, and launch right away
+    games.step(games.ball_x + BALL_SIZE//2, True)
+  elapsed = _time.perf_counter() - start
+  print("{} games x {} steps in {:.3f}s ({:.0f} steps/s)".format(n, steps, elapsed, n*steps/elapsed))
+  print("mean level: {:.2f} mean score: {:.1f}".format(games.level.mean(), games.score.mean()))
+
+if __name__ == "__main__":
+  main()
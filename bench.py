@@ -0,0 +1,236 @@
+#!/usr/bin/python3
+
+"""
+Copyright 2024 X Allegretta.
+
+This file is part of py3_bricksmasher.
+py3_bricksmasher is free software: you can redistribute it and/or modify it under the terms
+of the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+py3_bricksmasher is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+You should have received a copy of the GNU Lesser General Public License along with py3_bricksmasher.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# benchmarks.
+# times the game's hot paths headless, and optionally how long things take to start.
+# results can be saved as json and compared against an earlier run to catch regressions.
+# usage: python3 bench.py [--samples N] [--startup RUNS] [--only NAME] [--save FILE] [--compare FILE] [--tolerance PCT]
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time as _time
+
+# how long it takes a fresh python to start and run some code, in seconds.
+# returns the fastest and the median of several runs.
+def time_startup(code : str, runs : int) -> tuple:
+  env = dict(os.environ)
+  env["SDL_VIDEODRIVER"] = "dummy"
+  env["SDL_AUDIODRIVER"] = "dummy"
+  times = []
+  for i in range(runs):
+    start = _time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], check=True, env=env, stdout=subprocess.DEVNULL,
+      cwd=os.path.dirname(os.path.abspath(__file__)))
+    times.append(_time.perf_counter() - start)
+  times.sort()
+  return times[0], times[len(times)//2]
+
+# startup time of the game and of the font editor.
+# returns the results, stored by name.
+def bench_startup(runs : int) -> dict:
+  tests = [
+    ("python", "pass"),
+    # everything psf_curses.py imports, without starting curses
+    ("editor imports", "import psf, curses"),
+    ("load font", "import psf; f = psf.PSF(); f.loadFont('game.psf'); f.saveFont('/dev/null')"),
+    ("game imports", "import py3_bricksmasher"),
+    # open the window and draw the first frame
+    ("first frame", "import pygame, game, renderer; pygame.init(); "
+      "w = pygame.display.set_mode((game.WIN_W, game.WIN_H)); g = game.Game(); "
+      "renderer.Renderer(w, g).draw(g); pygame.display.flip()"),
+  ]
+  results = {}
+  print("startup ({} runs):".format(runs))
+  for name, code in tests:
+    best, median = time_startup(code, runs)
+    print("  {:16} best {:7.1f}ms  median {:7.1f}ms".format(name, best*1000, median*1000))
+    results["startup: " + name] = {"ops": 1/median, "p50": median, "p90": median, "p99": median, "best": best}
+  return results
+
+# time how long one call of fn takes.
+# calls are timed in groups big enough for the timer to be accurate, and each group is one sample.
+# returns the time per call of each sample, in seconds.
+def time_op(fn, samples : int, min_time : float = 0.002) -> list:
+  number = 1
+  while True:
+    start = _time.perf_counter()
+    for i in range(number):
+      fn()
+    elapsed = _time.perf_counter() - start
+    if elapsed >= min_time:
+      break
+    number *= 2
+  times = []
+  for i in range(samples):
+    start = _time.perf_counter()
+    for j in range(number):
+      fn()
+    times.append((_time.perf_counter() - start)/number)
+  return times
+
+# the value that p percent of values are at or below
+def percentile(values : list, p : float) -> float:
+  values = sorted(values)
+  return values[min(len(values)-1, int(len(values)*p/100))]
+
+# set up everything the hot path benchmarks need.
+# returns a list of (name, function to time).
+def hot_paths() -> list:
+  os.environ["SDL_VIDEODRIVER"] = "dummy"
+  os.environ["SDL_AUDIODRIVER"] = "dummy"
+  os.environ['PYGAME_HIDE_SUPPORT_PROMPT']="bluh." # disable pygame's welcome message.
+  os.chdir(os.path.dirname(os.path.abspath(__file__)))
+  import pygame
+  from game import Game, track_ball, WIN_W, WIN_H, BALL_SIZE, BRICK_H
+  from psf import PSF
+  from renderer import Renderer
+  from tint import set_color, hue_color
+  pygame.init()
+  win = pygame.display.set_mode((WIN_W, WIN_H))
+  tests = []
+
+  # text. the cache is cleared first so the text is really drawn.
+  font = PSF()
+  font.loadFont("game.psf")
+  font.setScale(40)
+  def render(text):
+    def fn():
+      font.cache.clear()
+      font.render(text)
+    return fn
+  tests.append(("render short", render("score: 001230")))
+  tests.append(("render long", render("click the mouse or press space to play again.")))
+  tests.append(("render cached", lambda: font.render("score: 001230")))
+
+  # coloring the real brick images
+  inner = pygame.image.load("bmps/brick_inner.bmp").convert_alpha()
+  tinted = inner.copy()
+  color = hue_color(270)
+  tests.append(("set_color", lambda: set_color(tinted, color)))
+  # how the game used to color bricks, with a copy of the image for each row
+  def rand_color(surf):
+    surfs = []
+    for i in range(4):
+      surfs.append(surf.copy())
+      set_color(surfs[i], hue_color(random.randrange(180,360)))
+    return surfs
+  tests.append(("rand_color", lambda: rand_color(inner)))
+
+  # brick collision. the ball is moved along the bottom row of bricks, which are put back when half are gone.
+  def fill(bricks, rows):
+    n = rows*bricks.cols
+    bricks.load(b"\1"*n + bytes(len(bricks.bricks)-n), n)
+  for rows in (2, 4):
+    game = Game(0)
+    game.rows = rows
+    fill(game.bricks, rows)
+    y = game.bricks.row_y(rows-1) + BRICK_H//2 - BALL_SIZE//2
+    xs = list(range(0, WIN_W - BALL_SIZE, 7))
+    def brick_col(game=game, rows=rows, y=y, xs=xs, i=[0]): # i is this test's position in xs
+      i[0] = (i[0]+1) % len(xs)
+      game.ball_x = xs[i[0]]
+      game.ball_y = y
+      game.brick_col()
+      if game.bricks.count < rows*game.bricks.cols//2:
+        fill(game.bricks, rows)
+    tests.append(("brick_col {} rows".format(rows), brick_col))
+
+  # drawing a frame, both redrawing everything and only what changed
+  game = Game(0)
+  game.step(WIN_W//2, True)
+  renderer = Renderer(win, game)
+  tests.append(("frame", lambda: renderer.draw(game)))
+  dirty_renderer = Renderer(win, game, True)
+  dirty_renderer.draw(game)
+  tests.append(("frame (dirty)", lambda: dirty_renderer.draw(game)))
+
+  # physics, with a player that follows the ball
+  game = Game(0)
+  tests.append(("physics tick", lambda: game.step(track_ball(game), True)))
+  swept_game = Game(0, True)
+  tests.append(("physics 8 ticks swept", lambda: swept_game.step(track_ball(swept_game), True, 8)))
+  return tests
+
+# time every hot path. returns the results, stored by name.
+def bench_hot_paths(samples : int, only : str = None) -> dict:
+  results = {}
+  print("hot paths ({} samples):".format(samples))
+  for name, fn in hot_paths():
+    if only and only not in name:
+      continue
+    times = time_op(fn, samples)
+    p50 = percentile(times, 50)
+    results[name] = {"ops": 1/p50, "p50": p50, "p90": percentile(times, 90), "p99": percentile(times, 99)}
+    print("  {:22} {:11.0f} ops/s  p50 {:9.2f}us  p90 {:9.2f}us  p99 {:9.2f}us".format(name, 1/p50,
+      p50*1e6, results[name]["p90"]*1e6, results[name]["p99"]*1e6))
+  return results
+
+# compare results against a baseline.
+# anything with a median time more than tolerance (a fraction) slower than the baseline is a regression.
+# returns the names of the regressions.
+def compare(results : dict, baseline : dict, tolerance : float) -> list:
+  regressions = []
+  print("compared to baseline (tolerance {:.0f}%):".format(tolerance*100))
+  for name, result in results.items():
+    if name not in baseline:
+      continue
+    change = result["p50"]/baseline[name]["p50"] - 1
+    flag = ""
+    if change > tolerance:
+      flag = "  REGRESSION"
+      regressions.append(name)
+    print("  {:22} {:+7.1f}%{}".format(name, change*100, flag))
+  return regressions
+
+def main():
+  parser = argparse.ArgumentParser(description="benchmarks for py3_bricksmasher.")
+  parser.add_argument("--samples", type=int, default=30,
+    help="how many samples to take of each hot path. (default: 30)")
+  parser.add_argument("--startup", type=int, default=0, metavar="RUNS",
+    help="also time startup, with this many runs of each test.")
+  parser.add_argument("--only", metavar="NAME",
+    help="only run hot paths with NAME in their name.")
+  parser.add_argument("--save", metavar="FILE",
+    help="save the results to FILE as json.")
+  parser.add_argument("--compare", metavar="FILE",
+    help="compare the results to a baseline saved with --save.")
+  parser.add_argument("--tolerance", type=float, default=10,
+    help="how many percent slower than the baseline counts as a regression. (default: 10)")
+  args = parser.parse_args()
+
+  results = {}
+  if args.startup > 0:
+    results.update(bench_startup(args.startup))
+  results.update(bench_hot_paths(args.samples, args.only))
+
+  if args.save:
+    f = open(args.save, "w")
+    json.dump({"python": platform.python_version(), "machine": platform.machine(), "results": results}, f, indent=2)
+    f.close()
+  if args.compare:
+    f = open(args.compare)
+    baseline = json.load(f)["results"]
+    f.close()
+    if compare(results, baseline, args.tolerance/100):
+      sys.exit(1)
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,111 @@
+#!/usr/bin/python3
+
+"""
+Copyright 2024 X Allegretta.
+
+This file is part of py3_bricksmasher.
+py3_bricksmasher is free software: you can redistribute it and/or modify it under the terms
+of the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+py3_bricksmasher is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+You should have received a copy of the GNU Lesser General Public License along with py3_bricksmasher.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import math
+
+# a grid of bricks.
+# since every brick is the same size and bricks are evenly spaced, the bricks a rectangle
+# touches can be worked out directly from its position, instead of checking every brick.
+
+class BrickField:
+  def __init__(self, rows : int, cols : int, x : int, y : int, w : int, h : int, gap : int):
+    self.rows = rows
+    self.cols = cols
+    # position of the first brick, size of each brick and space between them
+    self.x = x
+    self.y = y
+    self.w = w
+    self.h = h
+    self.gap = gap
+    self.bricks = bytearray(rows*cols) # how many hits each brick has left. 0 if there's no brick.
+    self.count = 0 # how many bricks are left
+    self.version = 0 # goes up every time a brick is added or removed, so changes are easy to spot
+
+  # put bricks where a compiled level has them (see levels.py).
+  # layout has to be the same size as the field, and count is how many bricks are in it.
+  def load(self, layout : bytes, count : int):
+    self.bricks[:] = layout
+    self.count = count
+    self.version += 1
+
+  def get(self, row : int, col : int) -> bool:
+    return self.bricks[row*self.cols+col] != 0
+
+  # hit a brick, taking away one of its hits. returns True if that destroyed it.
+  def hit(self, index : int) -> bool:
+    if self.bricks[index]:
+      self.bricks[index] -= 1
+      self.version += 1
+      if self.bricks[index] == 0:
+        self.count -= 1
+        return True
+    return False
+
+  # x position of the first brick in a row.
+  # odd rows are moved right by offset, even rows are moved left.
+  def row_x(self, row : int, offset : int = 0) -> int:
+    return self.x + offset*((row%2)*2-1)
+
+  def row_y(self, row : int) -> int:
+    return self.y + row*(self.h+self.gap)
+
+  # find the first brick (in row order) that overlaps a rectangle.
+  # returns the index of the brick, or -1 if there isn't one.
+  def find(self, x : int, y : int, w : int, h : int, offset : int = 0) -> int:
+    pitch_y = self.h + self.gap
+    pitch_x = self.w + self.gap
+    # rows that overlap the rectangle
+    first_row = (y - self.y - self.h)//pitch_y + 1
+    last_row = (y + h - self.y - 1)//pitch_y
+    if first_row < 0:
+      first_row = 0
+    if last_row >= self.rows:
+      last_row = self.rows-1
+    bricks = self.bricks
+    for row in range(first_row, last_row+1):
+      # columns that overlap the rectangle
+      row_x = self.row_x(row, offset)
+      first_col = (x - row_x - self.w)//pitch_x + 1
+      last_col = (x + w - row_x - 1)//pitch_x
+      if first_col < 0:
+        first_col = 0
+      if last_col >= self.cols:
+        last_col = self.cols-1
+      start = row*self.cols
+      for col in range(first_col, last_col+1):
+        if bricks[start+col]:
+          return start+col
+    return -1
+
+  # find every brick (in row order) that might overlap the area from (x0, y0) to (x1, y1).
+  # this can return a few bricks that only touch the area, but never misses one that overlaps it.
+  # unlike find(), the area can have fractional coordinates.
+  def find_all(self, x0 : float, y0 : float, x1 : float, y1 : float, offset : int = 0) -> list:
+    pitch_y = self.h + self.gap
+    pitch_x = self.w + self.gap
+    found = []
+    first_row = max(0, math.floor((y0 - self.y - self.h)/pitch_y))
+    last_row = min(self.rows-1, math.floor((y1 - self.y)/pitch_y))
+    bricks = self.bricks
+    for row in range(first_row, last_row+1):
+      row_x = self.row_x(row, offset)
+      first_col = max(0, math.floor((x0 - row_x - self.w)/pitch_x))
+      last_col = min(self.cols-1, math.floor((x1 - row_x)/pitch_x))
+      start = row*self.cols
+      for col in range(first_col, last_col+1):
+        if bricks[start+col]:
+          found.append(start+col)
+    return found
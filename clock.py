@@ -0,0 +1,65 @@
+#!/usr/bin/python3
+
+"""
+Copyright 2024 X Allegretta.
+
+This file is part of py3_bricksmasher.
+py3_bricksmasher is free software: you can redistribute it and/or modify it under the terms
+of the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+py3_bricksmasher is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+You should have received a copy of the GNU Lesser General Public License along with py3_bricksmasher.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# keeps the game running at the same speed on every machine.
+# the game is stepped a fixed number of times per second, no matter how often frames are drawn.
+
+import time as _time
+import os
+os.environ['PYGAME_HIDE_SUPPORT_PROMPT']="bluh." # disable pygame's welcome message.
+import pygame
+
+class GameClock:
+  # tick_rate is how many times per second the game is stepped.
+  # fps is the most frames to draw per second, or 0 for no limit.
+  # if sleep is False, the clock spins instead of sleeping while it waits. this is more accurate, but uses a whole core.
+  def __init__(self, tick_rate : int = 240, fps : int = 60, sleep : bool = True):
+    self.tick_rate = tick_rate
+    self.fps = fps
+    self.sleep = sleep
+    self.max_ticks = max(1, tick_rate//4) # the most ticks to run in one frame, so a slow frame can't snowball
+    self.clock = pygame.time.Clock()
+    self.alpha = 0.0 # how far between the last tick and the next one the current frame is, from 0 to 1
+    self.reset()
+
+  # forget about any time that has passed (after a pause, for example)
+  def reset(self):
+    self.last = _time.perf_counter()
+    self.acc = 0.0 # time that hasn't been used up by ticks yet
+
+  # wait for the next frame. returns how many ticks to step the game by.
+  def tick(self) -> int:
+    if self.fps > 0:
+      if self.sleep:
+        self.clock.tick(self.fps)
+      else:
+        self.clock.tick_busy_loop(self.fps)
+    now = _time.perf_counter()
+    self.acc += now - self.last
+    self.last = now
+    ticks = int(self.acc*self.tick_rate)
+    if ticks > self.max_ticks:
+      # running too slowly to keep up. drop the time instead of trying to catch up.
+      ticks = self.max_ticks
+      self.acc = 0.0
+    else:
+      self.acc -= ticks/self.tick_rate
+    self.alpha = self.acc*self.tick_rate
+    return ticks
+
+  # frames drawn per second, averaged over the last few frames
+  def get_fps(self) -> float:
+    return self.clock.get_fps()
@@ -0,0 +1,88 @@
+#!/usr/bin/python3
+
+"""
+Copyright 2024 X Allegretta.
+
+This file is part of py3_bricksmasher.
+py3_bricksmasher is free software: you can redistribute it and/or modify it under the terms
+of the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+py3_bricksmasher is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+You should have received a copy of the GNU Lesser General Public License along with py3_bricksmasher.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# the window, and how the game's 1280x720 playfield is fit onto it.
+
+import os
+os.environ['PYGAME_HIDE_SUPPORT_PROMPT']="bluh." # disable pygame's welcome message.
+import pygame
+from game import WIN_W, WIN_H
+
+# ways to fit the playfield onto the window
+class Scale_Enum():
+  NONE = 0 # the window is the size of the playfield. fullscreen is scaled by the driver, if at all.
+  SCALED = 1 # the game draws at 1280x720, and pygame.SCALED stretches it to the window on the gpu
+  PRESCALED = 2 # the game draws at the window's size, with every image scaled once ahead of time
+
+SCALE_NAMES = ("none", "scaled", "prescaled")
+
+class Display:
+  # size is the size of the window for PRESCALED. the other modes always use the playfield's size.
+  def __init__(self, mode : int = Scale_Enum.NONE, size : tuple = (WIN_W, WIN_H), vsync : bool = False):
+    self.mode = mode
+    self.size = size
+    self.vsync = vsync
+    self.fullscreen = False
+    self.win = None # the window
+    self.canvas = None # the part of the window the game is drawn on
+    self.canvas_rect = None # where the canvas is in the window
+    self.scale = 1.0 # size of the canvas compared to the playfield
+
+  def open(self):
+    if self.mode == Scale_Enum.PRESCALED:
+      if self.fullscreen:
+        self.win = pygame.display.set_mode(pygame.display.get_desktop_sizes()[0], pygame.FULLSCREEN)
+      else:
+        self.win = pygame.display.set_mode(self.size)
+    elif self.mode == Scale_Enum.SCALED or self.vsync:
+      # vsync only works with a scaled or opengl window
+      self.win = pygame.display.set_mode((WIN_W, WIN_H), pygame.SCALED, vsync=1 if self.vsync else 0)
+    else:
+      self.win = pygame.display.set_mode((WIN_W, WIN_H))
+    # the biggest canvas with the playfield's shape that fits, in the middle of the window
+    win_w, win_h = self.win.get_size()
+    self.scale = min(win_w/WIN_W, win_h/WIN_H)
+    self.canvas_rect = pygame.Rect(0, 0, int(WIN_W*self.scale), int(WIN_H*self.scale))
+    self.canvas_rect.center = (win_w//2, win_h//2)
+    self.win.fill((0, 0, 0))
+    self.canvas = self.win if self.canvas_rect.size == (win_w, win_h) else self.win.subsurface(self.canvas_rect)
+
+  # switch between fullscreen and windowed.
+  # returns True if the canvas changed, in which case everything drawn on it has to be redone at the new scale.
+  def toggle_fullscreen(self) -> bool:
+    if self.mode != Scale_Enum.PRESCALED:
+      pygame.display.toggle_fullscreen()
+      return False
+    self.fullscreen = not self.fullscreen
+    self.open()
+    return True
+
+  # turn an x position in the window (from the mouse) into one on the playfield
+  def to_playfield(self, x : int) -> int:
+    if self.mode != Scale_Enum.PRESCALED:
+      return x # pygame.SCALED already does this
+    return int((x - self.canvas_rect.x)/self.scale)
+
+  # show a frame. rects is what Renderer.draw() returned: None if the whole canvas was drawn,
+  # otherwise the rects on the canvas that changed.
+  def present(self, rects = None):
+    if rects is None:
+      pygame.display.flip() # swap buffers
+    elif self.canvas is self.win:
+      pygame.display.update(rects) # only update what changed
+    else:
+      x, y = self.canvas_rect.topleft
+      pygame.display.update([rect.move(x, y) for rect in rects])
@@ -0,0 +1,172 @@
+#!/usr/bin/python3
+
+"""
+Copyright 2024 X Allegretta.
+
+This file is part of py3_bricksmasher.
+py3_bricksmasher is free software: you can redistribute it and/or modify it under the terms
+of the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+py3_bricksmasher is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+You should have received a copy of the GNU Lesser General Public License along with py3_bricksmasher.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# a gym-style environment, for playing the game from code instead of with the mouse.
+#
+#   env = Env()
+#   obs = env.reset(seed)
+#   obs, reward, done, info = env.step(paddle_x)
+#
+# the action is where the center of the paddle should be, or None to leave it where it is.
+# the reward is how many points were scored, and done is True once the game is lost or won.
+# the observation is always the same numpy array, updated in place, so nothing is copied each step.
+# copy it if it needs to be kept.
+# usage: python3 env.py [state|pixels] [steps] [frame skip]
+
+import os
+import sys
+import time as _time
+import numpy as np
+from game import *
+
+# what's in a "state" observation. the hit points left of each brick (0 for no brick) come after these,
+# in row order.
+OBS_BALL_X = 0
+OBS_BALL_Y = 1
+OBS_BALL_W = 2
+OBS_BALL_H = 3
+OBS_BALL_SPEED_X = 4
+OBS_BALL_SPEED_Y = 5
+OBS_PADDLE_X = 6
+OBS_ROW_OFFSET = 7
+OBS_BRICKS = 8
+
+class Env:
+  # frame_skip is how many ticks each step() runs for.
+  # observation is "state" for a vector of the game's state, or "pixels" for the screen as a
+  # (height, width, 3) array of rgb values.
+  # if auto_launch is True, the ball is launched as soon as the paddle is moved.
+  # swept, levels and multiball are passed on to each Game.
+  def __init__(self, frame_skip : int = 4, observation : str = "state", auto_launch : bool = True,
+      swept : bool = False, levels : LevelPack = None, multiball : int = 0):
+    if observation not in ("state", "pixels"):
+      raise ValueError("observation must be \"state\" or \"pixels\"")
+    self.frame_skip = frame_skip
+    self.observation = observation
+    self.auto_launch = auto_launch
+    self.swept = swept
+    self.levels = levels if levels is not None else load_levels()
+    self.multiball = multiball
+    self.game = None
+    self.renderer = None
+    self.obs = None
+    if observation == "state":
+      self.obs = np.zeros(OBS_BRICKS + self.levels.rows*self.levels.cols, np.float32)
+    else:
+      self.init_pixels()
+
+  # set up a renderer that draws into a numpy array.
+  # the surface it draws on uses the array's memory, so the array never has to be copied out of it.
+  # (an array from pygame.surfarray.pixels3d() would lock the surface, and nothing can be drawn on a locked surface.)
+  def init_pixels(self):
+    os.environ['PYGAME_HIDE_SUPPORT_PROMPT']="bluh." # disable pygame's welcome message.
+    import pygame
+    from renderer import Renderer
+    if pygame.display.get_surface() is None:
+      # images are converted to the display's format so they draw quickly, so it's worth having one, even if nothing is shown
+      os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+      pygame.display.init()
+      pygame.display.set_mode((1, 1))
+    # 32-bit pixels, stored blue, green, red, alpha, which is what the display almost always uses
+    self.pixels = np.zeros((WIN_H, WIN_W, 4), np.uint8)
+    self.target = pygame.image.frombuffer(self.pixels, (WIN_W, WIN_H), "BGRA")
+    self.obs = self.pixels[:, :, 2::-1] # rgb, without copying
+    # only the parts that changed are drawn each step
+    self.renderer = Renderer(self.target, Game(0, self.swept, self.levels), True)
+    # fades go by the game's time at its normal 240 ticks per second, so the screen doesn't depend on how fast steps run
+    self.renderer.fade.clock = lambda: self.game.ticks/240
+
+  # start a new game. returns the first observation.
+  def reset(self, seed = None) -> np.ndarray:
+    self.game = Game(seed, self.swept, self.levels, self.multiball)
+    if self.renderer is not None:
+      self.renderer.update(self.game, Game_Enum.COLORS | Game_Enum.LEVEL | Game_Enum.LIVES | Game_Enum.SCORE)
+      self.renderer.invalidate()
+      self.renderer.fade.stop() # the fade's times were from the last game
+    return self.observe()
+
+  # move the paddle to action and run frame_skip ticks. launch overrides auto_launch.
+  # returns (observation, reward, done, info). info has the Game_Enum events of the step, and the counters.
+  # once done is True, the game has already started over, so call reset() before stepping again.
+  def step(self, action = None, launch : bool = None):
+    game = self.game
+    if launch is None:
+      launch = self.auto_launch
+    score = game.score
+    if self.swept:
+      events = game.step(action, launch, self.frame_skip)
+    else:
+      # stepping n ticks is the same as stepping once and then n-1 ticks with no input.
+      # going one tick at a time means the step can stop as soon as the game ends.
+      events = game.step(action, launch)
+      for i in range(1, self.frame_skip):
+        if events & (Game_Enum.GAME_OVER | Game_Enum.GAME_WON):
+          break
+        events |= game.step()
+    # the score goes back to 0 when the game is lost, which isn't a penalty
+    reward = game.score - score if not events & Game_Enum.GAME_OVER else 0
+    done = events & (Game_Enum.GAME_OVER | Game_Enum.GAME_WON) != 0
+    if self.renderer is not None:
+      self.renderer.update(game, events)
+    info = {"events": events, "level": game.level, "lives": game.lives, "score": game.score}
+    return self.observe(), reward, done, info
+
+  # update the observation in place
+  def observe(self) -> np.ndarray:
+    game = self.game
+    if self.renderer is not None:
+      self.renderer.draw(game)
+      return self.obs
+    obs = self.obs
+    obs[OBS_BALL_X] = game.ball_x
+    obs[OBS_BALL_Y] = game.ball_y
+    obs[OBS_BALL_W] = BALL_SIZE
+    obs[OBS_BALL_H] = BALL_SIZE
+    obs[OBS_BALL_SPEED_X] = game.ball_speed_x
+    obs[OBS_BALL_SPEED_Y] = game.ball_speed_y
+    obs[OBS_PADDLE_X] = game.paddle_x
+    obs[OBS_ROW_OFFSET] = game.row_offset
+    obs[OBS_BRICKS:] = np.frombuffer(game.bricks.bricks, np.uint8)
+    return obs
+
+# play games with track_ball() and print how fast steps went
+def main():
+  observation = "state"
+  steps = 100000
+  frame_skip = 4
+  if len(sys.argv) > 1:
+    observation = sys.argv[1]
+  if len(sys.argv) > 2:
+    steps = int(sys.argv[2])
+  if len(sys.argv) > 3:
+    frame_skip = int(sys.argv[3])
+  env = Env(frame_skip, observation)
+  env.reset(0)
+  games = 0
+  total = 0
+  start = _time.perf_counter()
+  for i in range(steps):
+    obs, reward, done, info = env.step(track_ball(env.game))
+    total += reward
+    if done:
+      games += 1
+      env.reset(i)
+  elapsed = _time.perf_counter() - start
+  print("{} steps in {:.3f}s ({:.0f} steps/s, {:.0f} ticks/s)".format(steps, elapsed, steps/elapsed, steps*frame_skip/elapsed))
+  print("games finished: {} total reward: {}".format(games, total))
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,654 @@
+#!/usr/bin/python3
+
+"""
+Copyright 2024 X Allegretta.
+
+This file is part of py3_bricksmasher.
+py3_bricksmasher is free software: you can redistribute it and/or modify it under the terms
+of the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+py3_bricksmasher is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+You should have received a copy of the GNU Lesser General Public License along with py3_bricksmasher.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# the rules of the game, without any rendering, sound or input handling.
+# nothing in here needs pygame, so games can be simulated headless as fast as python allows.
+
+import array
+import math
+import random
+import struct
+import sys
+import time as _time
+from bricks import *
+from levels import *
+
+# window size
+WIN_W = 1280
+WIN_H = 720
+
+# paddle sizes (these match bmps/paddle1.bmp and bmps/paddle2.bmp)
+PADDLE_W = (200, 150)
+PADDLE_H = 25
+
+# ball collision box. the ball image is 48x48 and drawn 4 pixels up and to the left of this.
+BALL_SIZE = 40
+BALL_IMG_OFFSET = 4
+
+# brick layout
+BRICK_X = 6
+BRICK_Y = 54
+BRICK_W = 100
+BRICK_H = 50
+BRICK_GAP = 6
+BRICK_COLS = 12
+BRICK_ROWS = 4
+
+# events returned by Game.step().
+# these are bit flags, since more than one thing can happen in a single step.
+class Game_Enum():
+  NONE = 0
+  BOUNCE = 1 # ball hit a brick, wall or paddle
+  SCORE = 2 # score changed
+  LIVES = 4 # lives changed
+  LEVEL = 8 # level changed
+  LEVEL_BEATEN = 16 # all bricks were destroyed
+  GAME_OVER = 32 # ran out of lives
+  GAME_WON = 64 # beat the last level. the game has already been reset for another round.
+  COLORS = 128 # brick colors were re-randomized
+
+# how many times the ball can bounce in one swept move
+MAX_BOUNCES = 16
+
+# the counters and positions in a Snapshot, packed together
+SNAPSHOT_STATE = struct.Struct("<qiiiiiiiiiiiiqiBB?dd")
+# what Snapshot.pack() starts with: magic, version, then the number of bricks, rows of hues and extra balls
+SNAPSHOT_MAGIC = b"BSSN"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct("<4sBIII")
+
+# check if two rectangles overlap. works the same as pygame.Rect.colliderect.
+def collide(ax : int, ay : int, aw : int, ah : int, bx : int, by : int, bw : int, bh : int) -> bool:
+  return ax < bx+bw and bx < ax+aw and ay < by+bh and by < ay+ah
+
+# find when a point at (x, y), moving by (vx, vy) every tick, first enters the box from (x0, y0) to (x1, y1).
+# to sweep a rectangle instead of a point, grow the box by the rectangle's size first.
+# returns (time, axis), where axis is 0 if it hit a left or right side and 1 if it hit the top or bottom,
+# or None if it doesn't hit within t_max ticks. if it starts inside the box, the time is 0.
+def sweep(x : float, y : float, vx : float, vy : float, x0 : float, y0 : float, x1 : float, y1 : float, t_max : float):
+  if vx == 0:
+    if x <= x0 or x >= x1:
+      return None
+    tx0 = -math.inf
+    tx1 = math.inf
+  else:
+    tx0 = (x0 - x)/vx
+    tx1 = (x1 - x)/vx
+    if tx0 > tx1:
+      tx0, tx1 = tx1, tx0
+  if vy == 0:
+    if y <= y0 or y >= y1:
+      return None
+    ty0 = -math.inf
+    ty1 = math.inf
+  else:
+    ty0 = (y0 - y)/vy
+    ty1 = (y1 - y)/vy
+    if ty0 > ty1:
+      ty0, ty1 = ty1, ty0
+  t0 = max(tx0, ty0)
+  t1 = min(tx1, ty1)
+  if t0 >= t1 or t0 >= t_max or t1 <= 0:
+    return None
+  return (max(t0, 0.0), 0 if tx0 > ty0 else 1)
+
+# everything needed to put a Game back the way it was, made by Game.snapshot().
+# a snapshot can only be restored onto a game with the same level pack, swept setting and multiball setting.
+class Snapshot:
+  __slots__ = ("state", "bricks", "hues", "rng", "balls")
+
+  def __init__(self):
+    self.state = b"" # packed with SNAPSHOT_STATE
+    self.bricks = b"" # hit points of each brick
+    self.hues = ((), ()) # hues of the inner and glow parts of each row of bricks
+    self.rng = None # state of the game's rng, from Random.getstate()
+    self.balls = None # x, y, speed_x and speed_y of the extra balls, if there are any
+
+  # the whole snapshot as bytes, to save or send to another process
+  def pack(self) -> bytes:
+    version, internal, gauss = self.rng
+    balls = self.balls if self.balls is not None else ()
+    count = len(balls[0]) if balls else 0
+    return b"".join([
+      SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(self.bricks), len(self.hues[0]), count),
+      self.state,
+      self.bricks,
+      array.array("H", self.hues[0] + self.hues[1]).tobytes(),
+      # the rng's 624 words of state and its position in them
+      array.array("I", internal).tobytes(),
+      struct.pack("<d", math.nan if gauss is None else gauss),
+    ] + [values.astype("<i4").tobytes() for values in balls])
+
+  # read a snapshot made by pack(). raises ValueError if data isn't one.
+  @staticmethod
+  def unpack(data : bytes):
+    if len(data) < SNAPSHOT_HEADER.size:
+      raise ValueError("not a snapshot")
+    magic, version, bricks, rows, count = SNAPSHOT_HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+      raise ValueError("not a snapshot, or from a different version of the game")
+    size = SNAPSHOT_HEADER.size + SNAPSHOT_STATE.size + bricks + 4*rows + 625*4 + 8 + 16*count
+    if len(data) != size:
+      raise ValueError("snapshot is the wrong size")
+    snap = Snapshot()
+    pos = SNAPSHOT_HEADER.size
+    snap.state = bytes(data[pos:pos+SNAPSHOT_STATE.size])
+    pos += SNAPSHOT_STATE.size
+    snap.bricks = bytes(data[pos:pos+bricks])
+    pos += bricks
+    hues = array.array("H", data[pos:pos+4*rows])
+    snap.hues = (tuple(hues[:rows]), tuple(hues[rows:]))
+    pos += 4*rows
+    internal = tuple(array.array("I", data[pos:pos+625*4]))
+    pos += 625*4
+    gauss = struct.unpack_from("<d", data, pos)[0]
+    pos += 8
+    snap.rng = (3, internal, None if math.isnan(gauss) else gauss)
+    if count > 0:
+      import numpy as np
+      snap.balls = tuple(np.frombuffer(data, "<i4", count, pos + i*4*count).astype(np.int32) for i in range(4))
+    return snap
+
+# all of the state of one game.
+class Game:
+  # if swept is True, the ball is moved with swept collision instead of one axis at a time.
+  # it can then be moved any number of ticks in one step without passing through anything.
+  # levels is the LevelPack to play, or None for the default levels.
+  # multiball is how many extra balls are launched along with the ball. extra balls need numpy.
+  def __init__(self, seed = None, swept : bool = False, levels : LevelPack = None, multiball : int = 0):
+    # used for brick colors, and where extra balls start. only use it through randrange() and choice(),
+    # so snapshots can tell when it has been used.
+    self._rng = random.Random(seed)
+    self._rng_state = None # the rng's state the last time it was saved, or None if it's been used since
+    self.swept = swept
+    self.levels = levels if levels is not None else load_levels()
+    self.multiball = multiball
+    self.balls = None # extra balls, if there are any
+    if multiball > 0:
+      from balls import BallSet
+      self.balls = BallSet()
+    self.events = Game_Enum.NONE
+    self.width = WIN_W
+    self.height = WIN_H
+
+    # used to decide whether or not to handle ball movement and when to rotate the ball
+    self.time = 0
+    self.ticks = 0 # total number of steps taken
+
+    # paddle
+    self.paddle_index = 0 # 0 is the large paddle, 1 is the small paddle
+    self.paddle_x = self.width//2 - PADDLE_W[0]//2
+    self.paddle_y = self.height - PADDLE_H - 4
+
+    # ball
+    self.ball_x = self.width//2 - BALL_SIZE//2
+    self.ball_y = self.height - 74
+    self.ball_new = True # keep ball on paddle, to start
+    self.ball_speed_x = 2
+    self.ball_speed_y = -2
+    self.ball_img_index = 0 # which of the rotated ball images to draw
+
+    # bricks
+    self.rows = 0 # rows in the current level
+    self.row_offset = 0
+    self.row_offset_max = 0 # by how much the different rows will move back and forth
+    self.row_offset_add = 0 # how much to change the offset by
+    self.row_delay = 0 # ticks between row moves, when the rows are in the middle
+    self.ball_skip = 3 # the ball sits out every <ball_skip>th tick
+    self.bricks = BrickField(self.levels.rows, self.levels.cols, BRICK_X, BRICK_Y, BRICK_W, BRICK_H, BRICK_GAP)
+    self.brick_hues = [[], []] # hues of the inner and glow parts of each row of bricks
+    self.new_colors()
+
+    # counters
+    self.level = 1
+    self.lives = 3
+    self.score = 0
+    self.start_level()
+
+  # random numbers, from the game's seed. like random.randrange() and random.choice().
+  def randrange(self, start : int, stop : int = None) -> int:
+    self._rng_state = None # the rng is about to change, so a saved state is out of date
+    return self._rng.randrange(start, stop)
+
+  def choice(self, seq):
+    self._rng_state = None
+    return self._rng.choice(seq)
+
+  # pick new random hues for each row of bricks
+  def new_colors(self):
+    for hues in self.brick_hues:
+      hues.clear()
+      for i in range(self.bricks.rows):
+        hues.append(self.randrange(180, 360))
+    self.events |= Game_Enum.COLORS
+
+  # save everything that changes while playing, without touching anything pygame draws
+  def snapshot(self) -> Snapshot:
+    snap = Snapshot()
+    snap.state = SNAPSHOT_STATE.pack(self.ticks, self.time, self.paddle_x, self.ball_speed_x, self.ball_speed_y,
+      self.rows, self.row_offset, self.row_offset_max, self.row_offset_add, self.row_delay, self.ball_skip,
+      self.level, self.lives, self.score, self.bricks.count, self.paddle_index, self.ball_img_index, self.ball_new,
+      self.ball_x, self.ball_y)
+    snap.bricks = bytes(self.bricks.bricks)
+    snap.hues = (tuple(self.brick_hues[0]), tuple(self.brick_hues[1]))
+    # copying the rng's state is the slowest part, and the rng is hardly ever used, so it's only done again once it has been
+    if self._rng_state is None:
+      self._rng_state = self._rng.getstate()
+    snap.rng = self._rng_state
+    if self.balls is not None:
+      snap.balls = (self.balls.x.copy(), self.balls.y.copy(), self.balls.speed_x.copy(), self.balls.speed_y.copy())
+    return snap
+
+  # put the game back the way it was when snap was made.
+  # returns the Game_Enum flags of the counters and colors that changed, to pass on to Renderer.update().
+  def restore(self, snap : Snapshot) -> int:
+    changed = (self.level, self.lives, self.score)
+    (self.ticks, self.time, self.paddle_x, self.ball_speed_x, self.ball_speed_y,
+      self.rows, self.row_offset, self.row_offset_max, self.row_offset_add, self.row_delay, self.ball_skip,
+      self.level, self.lives, self.score, count, self.paddle_index, self.ball_img_index, self.ball_new,
+      ball_x, ball_y) = SNAPSHOT_STATE.unpack(snap.state)
+    # only swept games move the ball by fractions of a pixel
+    if self.swept:
+      self.ball_x = ball_x
+      self.ball_y = ball_y
+    else:
+      self.ball_x = int(ball_x)
+      self.ball_y = int(ball_y)
+    self.bricks.load(snap.bricks, count)
+    events = Game_Enum.NONE
+    if changed[0] != self.level:
+      events |= Game_Enum.LEVEL
+    if changed[1] != self.lives:
+      events |= Game_Enum.LIVES
+    if changed[2] != self.score:
+      events |= Game_Enum.SCORE
+    if tuple(self.brick_hues[0]) != snap.hues[0] or tuple(self.brick_hues[1]) != snap.hues[1]:
+      self.brick_hues[0][:] = snap.hues[0]
+      self.brick_hues[1][:] = snap.hues[1]
+      events |= Game_Enum.COLORS
+    if snap.rng is not self._rng_state:
+      self._rng.setstate(snap.rng)
+      self._rng_state = snap.rng
+    if self.balls is not None:
+      # a snapshot read back by Snapshot.unpack() has no balls if there weren't any in play when it was made
+      if snap.balls is None:
+        self.balls.clear()
+      else:
+        self.balls.x, self.balls.y, self.balls.speed_x, self.balls.speed_y = [values.copy() for values in snap.balls]
+    return events
+
+  # x position of the first brick in a row
+  def row_x(self, row : int) -> int:
+    return self.bricks.row_x(row, self.row_offset)
+
+  # check for a collision between the ball and any brick.
+  # if there is one, the brick is removed and its position is stored in hit_x and hit_y.
+  def brick_col(self) -> bool:
+    bricks = self.bricks
+    index = bricks.find(self.ball_x, self.ball_y, BALL_SIZE, BALL_SIZE, self.row_offset)
+    if index < 0:
+      return False
+    self.events |= Game_Enum.BOUNCE
+    # hit brick
+    self.update_score = True
+    bricks.hit(index)
+    row = index//bricks.cols
+    self.hit_x = bricks.row_x(row, self.row_offset) + (index%bricks.cols)*(BRICK_W+BRICK_GAP)
+    self.hit_y = bricks.row_y(row)
+    return True
+
+  # move the paddle so that its center is at x, keeping it in-bounds
+  def move_paddle(self, x : int):
+    w = PADDLE_W[self.paddle_index]
+    self.paddle_x = int(x) - w//2
+    if self.paddle_x < 0:
+      self.paddle_x = 0
+    elif self.paddle_x > self.width - w:
+      self.paddle_x = self.width - w
+
+  # switch between paddle sizes, keeping the paddle centered where it was
+  def set_paddle(self, index : int):
+    if index != self.paddle_index:
+      x = self.paddle_x + PADDLE_W[self.paddle_index]//2
+      self.paddle_index = index
+      self.move_paddle(x)
+
+  # put the ball back on the paddle
+  def reset_ball(self):
+    if self.balls is not None:
+      self.balls.clear() # extra balls only last as long as the ball they were launched with
+    self.ball_new = True
+    self.ball_x = self.paddle_x + PADDLE_W[self.paddle_index]//2 - BALL_SIZE//2
+    self.ball_y = self.paddle_y - BALL_SIZE
+
+  # put back every brick in the current level
+  def reset_bricks(self):
+    level = self.levels.levels[self.level-1]
+    self.bricks.load(level.layout, level.count)
+
+  # set up the paddle, rows and bricks for the current level
+  def start_level(self):
+    level = self.levels.levels[self.level-1]
+    self.set_paddle(level.paddle)
+    self.rows = level.rows
+    self.ball_skip = level.ball
+    self.row_offset_add = level.motion
+    self.row_offset_max = level.motion_max
+    self.row_delay = level.motion_delay
+    self.row_offset = 0
+    self.reset_bricks()
+
+  # advance the game by some number of ticks (one, unless it's a swept game).
+  # paddle_x is where the center of the paddle should be, or None if it didn't move.
+  # launch releases a ball that's stuck to the paddle.
+  # returns the Game_Enum flags of everything that happened.
+  def step(self, paddle_x = None, launch : bool = False, ticks : int = 1) -> int:
+    self.events = Game_Enum.NONE
+
+    # --- paddle ---
+    if paddle_x is not None:
+      self.move_paddle(paddle_x)
+      # keep a new ball stuck to paddle
+      if self.ball_new:
+        self.ball_x = self.paddle_x + PADDLE_W[self.paddle_index]//2 - BALL_SIZE//2
+        # launch ball
+        if launch:
+          self.ball_new = False
+          self.ball_speed_y = -2
+          self.ball_speed_x = 2
+          if paddle_x > self.width/2:
+            self.ball_speed_x *= -1
+          if self.balls is not None:
+            self.balls.spawn(self, self.multiball)
+
+    if self.swept:
+      self.advance_swept(ticks)
+    else:
+      for i in range(ticks):
+        self.advance()
+    return self.events
+
+  # one tick of the game
+  def advance(self):
+    self.update_score = False
+    if self.time%12 == 0: # rotate ball
+      self.ball_img_index = (self.ball_img_index+1) % 4
+    # --- ball movement + collision ---
+    if self.ball_new == False and self.time%self.ball_skip != 0:
+      self.move_ball()
+      if self.balls: # only if there are extra balls
+        self.move_balls()
+    self.next_tick()
+
+  # count time and move the rows of bricks
+  def next_tick(self):
+    self.time = (self.time+1) % (3*4*5*7)
+    self.ticks += 1
+    # decide when to move rows
+    if self.row_offset_max > 0:
+      if self.time%(self.row_delay+int(10*abs(self.row_offset)/self.row_offset_max)) == 0:
+        if abs(self.row_offset) == self.row_offset_max:
+          self.row_offset_add *= -1
+        self.row_offset += self.row_offset_add
+
+  # several ticks of the game, with the ball moved all at once
+  def advance_swept(self, ticks : int):
+    moves = 0 # how many ticks the ball would have moved in
+    for i in range(ticks):
+      if self.time%12 == 0: # rotate ball
+        self.ball_img_index = (self.ball_img_index+1) % 4
+      if self.ball_new == False and self.time%self.ball_skip != 0:
+        moves += 1
+      self.next_tick()
+    if moves > 0:
+      self.move_ball_swept(moves)
+      # extra balls aren't swept, so they are moved one tick at a time
+      for i in range(moves):
+        if not self.balls:
+          break
+        self.move_balls()
+
+  # move the extra balls one tick. every brick they hit is worth points.
+  def move_balls(self):
+    hits = self.balls.move(self)
+    if hits > 0:
+      self.score += 10*hits
+      self.events |= Game_Enum.SCORE
+      if self.bricks.count == 0:
+        self.next_level()
+
+  def move_ball(self):
+    # --- x-axis ---
+    self.ball_x += self.ball_speed_x
+    # brick collision detection
+    if self.brick_col():
+      # move ball to side
+      if self.ball_speed_x < 0:
+        self.ball_x = self.hit_x + BRICK_W
+      else:
+        self.ball_x = self.hit_x - BALL_SIZE
+      self.ball_speed_x *= -1 # change ball direction
+    # screen border collision
+    # left side
+    if self.ball_x < 0:
+      self.events |= Game_Enum.BOUNCE
+      self.ball_x = 0
+      self.ball_speed_x *= -1
+    # right side
+    elif self.ball_x > self.width - BALL_SIZE:
+      self.events |= Game_Enum.BOUNCE
+      self.ball_x = self.width - BALL_SIZE
+      self.ball_speed_x *= -1
+
+    # --- y-axis ---
+    self.ball_y += self.ball_speed_y
+    # brick collision detection
+    if self.brick_col():
+      # update ball position
+      if self.ball_speed_y < 0:
+        self.ball_y = self.hit_y + BRICK_H
+      else:
+        self.ball_y = self.hit_y - BALL_SIZE
+      self.ball_speed_y *= -1 # change direction
+
+    # paddle collision
+    self.paddle_col()
+
+    # screen border collision
+    # top of screen
+    if self.ball_y < 0:
+      self.events |= Game_Enum.BOUNCE
+      self.ball_y = 0
+      self.ball_speed_y *= -1 # change direction
+    # bottom
+    elif self.ball_y > self.height + 2*BALL_SIZE:
+      self.lose_life()
+
+    # update score
+    if self.update_score:
+      self.score += 10
+      self.events |= Game_Enum.SCORE
+      # if won
+      if self.bricks.count == 0:
+        self.next_level()
+
+  def paddle_col(self):
+    w = PADDLE_W[self.paddle_index]
+    if collide(self.paddle_x, self.paddle_y, w, PADDLE_H, self.ball_x, self.ball_y, BALL_SIZE, BALL_SIZE):
+      self.paddle_bounce()
+
+  # put the ball on top of the paddle and send it back up
+  def paddle_bounce(self):
+    w = PADDLE_W[self.paddle_index]
+    self.events |= Game_Enum.BOUNCE
+    self.ball_y = self.paddle_y - BALL_SIZE
+    # get x distance of ball center to paddle center + side of collision
+    ball_dist = self.ball_x + BALL_SIZE/2 - (self.paddle_x + w/2)
+    # if ball hits center, faster on y, same x direction as previous
+    if abs(ball_dist) <= w/6:
+      self.ball_speed_x = 1 if self.ball_speed_x > 0 else -1
+      self.ball_speed_y = -3
+    # if ball hits in-between center and side, same on x and y, same direction
+    elif abs(ball_dist) <= w*(3.0/8.0):
+      self.ball_speed_x = 2 if self.ball_speed_x > 0 else -2
+      self.ball_speed_y = -2
+    else: # if hits edges, faster on x than y, direction based on side of paddle
+      self.ball_speed_x = 3 if ball_dist > 0 else -3
+      self.ball_speed_y = -1
+
+  # move the ball along its path for some number of ticks, bouncing off of everything it hits on the way.
+  # unlike move_ball(), every brick hit is worth points, since many ticks can pass in one move.
+  def move_ball_swept(self, t_left : float):
+    bricks = self.bricks
+    hits = 0
+    for i in range(0, MAX_BOUNCES):
+      x = self.ball_x
+      y = self.ball_y
+      vx = self.ball_speed_x
+      vy = self.ball_speed_y
+      # find the first thing the ball hits
+      first = None # (time, axis)
+      what = 0 # 1 for a wall, 2 for the paddle, 3 for a brick
+      index = -1
+      # screen borders
+      if vx < 0 and x + vx*t_left < 0:
+        first = (x/-vx, 0)
+        what = 1
+      elif vx > 0 and x + vx*t_left > self.width - BALL_SIZE:
+        first = ((self.width - BALL_SIZE - x)/vx, 0)
+        what = 1
+      if vy < 0 and y + vy*t_left < 0 and (first is None or y/-vy < first[0]):
+        first = (y/-vy, 1)
+        what = 1
+      # paddle
+      w = PADDLE_W[self.paddle_index]
+      hit = sweep(x, y, vx, vy, self.paddle_x-BALL_SIZE, self.paddle_y-BALL_SIZE, self.paddle_x+w, self.paddle_y+PADDLE_H, t_left)
+      if hit is not None and (first is None or hit[0] < first[0]):
+        first = hit
+        what = 2
+      # bricks near the ball's path
+      end_x = x + vx*t_left
+      end_y = y + vy*t_left
+      for brick in bricks.find_all(min(x, end_x), min(y, end_y), max(x, end_x)+BALL_SIZE, max(y, end_y)+BALL_SIZE, self.row_offset):
+        row = brick//bricks.cols
+        bx = bricks.row_x(row, self.row_offset) + (brick%bricks.cols)*(BRICK_W+BRICK_GAP)
+        by = bricks.row_y(row)
+        hit = sweep(x, y, vx, vy, bx-BALL_SIZE, by-BALL_SIZE, bx+BRICK_W, by+BRICK_H, t_left)
+        if hit is not None and (first is None or hit[0] < first[0]):
+          first = hit
+          what = 3
+          index = brick
+          self.hit_x = bx
+          self.hit_y = by
+
+      if first is None:
+        # nothing in the way
+        self.ball_x = end_x
+        self.ball_y = end_y
+        break
+
+      # move to where it hit
+      t, axis = first
+      self.ball_x = x + vx*t
+      self.ball_y = y + vy*t
+      t_left -= t
+      if what == 1: # screen border
+        self.events |= Game_Enum.BOUNCE
+        if axis == 0:
+          self.ball_x = 0 if vx < 0 else self.width - BALL_SIZE
+          self.ball_speed_x *= -1
+        else:
+          self.ball_y = 0
+          self.ball_speed_y *= -1
+      elif what == 2: # paddle
+        self.paddle_bounce()
+      else: # brick
+        self.events |= Game_Enum.BOUNCE
+        bricks.hit(index)
+        hits += 1
+        if axis == 0:
+          self.ball_x = self.hit_x + BRICK_W if vx < 0 else self.hit_x - BALL_SIZE
+          self.ball_speed_x *= -1
+        else:
+          self.ball_y = self.hit_y + BRICK_H if vy < 0 else self.hit_y - BALL_SIZE
+          self.ball_speed_y *= -1
+        if bricks.count == 0:
+          break
+      if t_left <= 0:
+        break
+
+    # bottom of screen
+    if self.ball_y > self.height + 2*BALL_SIZE:
+      self.lose_life()
+    # update score
+    if hits > 0:
+      self.score += 10*hits
+      self.events |= Game_Enum.SCORE
+      # if won
+      if bricks.count == 0:
+        self.next_level()
+
+  def lose_life(self):
+    self.lives -= 1
+    if self.lives == -1:
+      # game over ==> start again from the first level
+      self.events |= Game_Enum.GAME_OVER | Game_Enum.LEVEL | Game_Enum.SCORE
+      self.level = 1
+      self.score = 0
+      self.lives = 3
+      self.new_colors()
+      self.start_level()
+    self.events |= Game_Enum.LIVES
+    self.reset_ball() # ball will stick to paddle
+
+  def next_level(self):
+    self.new_colors()
+    self.level += 1
+    if self.level > len(self.levels.levels): # game won!
+      self.events |= Game_Enum.GAME_WON
+      self.lives += self.levels.win_lives
+      self.level = 1
+    else:
+      self.events |= Game_Enum.LEVEL_BEATEN
+      self.lives += self.levels.levels[self.level-1].lives
+    self.events |= Game_Enum.LEVEL | Game_Enum.LIVES
+    self.start_level()
+    self.reset_ball()
+
+# a simple player that keeps the paddle under the ball and launches it right away.
+# used to soak test the game without anyone at the mouse.
+def track_ball(game : Game) -> int:
+  return game.ball_x + BALL_SIZE//2
+
+# run a headless game for a number of steps and print how fast it went.
+# if a number of ticks per step is given, the game uses swept collision.
+def main():
+  steps = 1000000
+  ticks = 1
+  if len(sys.argv) > 1:
+    steps = int(sys.argv[1])
+  if len(sys.argv) > 2:
+    ticks = int(sys.argv[2])
+  game = Game(0, len(sys.argv) > 2)
+  start = _time.perf_counter()
+  for i in range(steps):
+    game.step(track_ball(game), game.ball_new, ticks)
+  elapsed = _time.perf_counter() - start
+  print("{} steps in {:.3f}s ({:.0f} steps/s)".format(steps, elapsed, steps/elapsed))
+  print("level: {} lives: {} score: {}".format(game.level, game.lives, game.score))
+
+if __name__ == "__main__":
+  main()
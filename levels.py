@@ -0,0 +1,234 @@
+#!/usr/bin/python3
+
+"""
+Copyright 2024 X Allegretta.
+
+This file is part of py3_bricksmasher.
+py3_bricksmasher is free software: you can redistribute it and/or modify it under the terms
+of the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+py3_bricksmasher is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+You should have received a copy of the GNU Lesser General Public License along with py3_bricksmasher.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# level packs.
+# a level pack is a text file with a [level] section for each level, in the order they are played:
+#
+#   # comments start with '#'
+#   [pack]
+#   win_lives = 3      # lives given for beating the last level
+#   [level]
+#   paddle = small     # "large" or "small"
+#   lives = 1          # lives given for reaching this level, 0 or more
+#   ball = 5           # the ball sits out every <ball>th tick, so higher is faster
+#   motion = 2 80 4    # rows move 2 pixels every 4 ticks (slower further out), up to 80 pixels.
+#                      # the most has to be a multiple of how far they move.
+#   1111.11.1111
+#   222222222222       # each digit is a brick, and how many hits it takes. '.' is no brick.
+#
+# the grid size of a level is the number of brick lines and the length of the longest one.
+# a pack is compiled once into one bytes object per level, so starting a level is a single copy.
+
+class Level_Enum():
+  OKAY = 0
+  OPEN_FILE = 1
+  INVALID_LINE = 2
+  INVALID_VALUE = 3
+  INVALID_SIZE = 4
+  NO_LEVELS = 5
+
+# the biggest grid that fits on the screen
+LEVEL_MAX_ROWS = 8
+LEVEL_MAX_COLS = 12
+
+# the levels the game has always had
+DEFAULT_LEVELS = """
+[pack]
+win_lives = 3
+
+[level]
+ball = 3
+111111111111
+111111111111
+
+[level]
+ball = 4
+111111111111
+111111111111
+111111111111
+
+[level]
+ball = 5
+motion = 1 40 5
+111111111111
+111111111111
+111111111111
+111111111111
+
+[level]
+paddle = small
+ball = 6
+motion = 2 80 4
+111111111111
+111111111111
+111111111111
+111111111111
+
+[level]
+paddle = small
+ball = 7
+motion = 3 120 3
+111111111111
+111111111111
+111111111111
+111111111111
+
+[level]
+paddle = small
+lives = 1
+ball = 8
+motion = 4 160 2
+111111111111
+111111111111
+111111111111
+111111111111
+"""
+
+class Level:
+  def __init__(self):
+    self.paddle = 0 # 0 is the large paddle, 1 is the small paddle
+    self.lives = 0 # lives given for reaching the level
+    self.ball = 3 # the ball sits out every <ball>th tick
+    self.motion = 0 # how far the rows move each time they move
+    self.motion_max = 0 # how far the rows can move from the middle
+    self.motion_delay = 0 # how many ticks between moves, when the rows are in the middle
+    self.grid = [] # hit points of each brick, one list for each row, as it was in the file. emptied by compile().
+    self.rows = 0 # number of rows with bricks in them
+    self.layout = b"" # hit points of each brick, padded to the pack's grid size
+    self.count = 0 # how many bricks there are
+
+class LevelPack:
+  def __init__(self):
+    self.levels = []
+    self.win_lives = 3 # lives given for beating the last level
+    self.rows = 0 # size of the biggest level, which is the size of the brick field
+    self.cols = 0
+
+  def load(self, filename : str) -> int:
+    try:
+      f = open(filename, "r")
+    except OSError:
+      print("Error: Failed to open \"" + filename + "\".")
+      return Level_Enum.OPEN_FILE
+    text = f.read()
+    f.close()
+    return self.parse(text, filename)
+
+  # read a pack from text. name is used in error messages.
+  def parse(self, text : str, name : str = "levels") -> int:
+    levels = []
+    section = None
+    for number, line in enumerate(text.split("\n"), 1):
+      line = line.split("#")[0].strip()
+      if len(line) == 0:
+        continue
+      if line == "[pack]":
+        section = "pack"
+      elif line == "[level]":
+        section = "level"
+        levels.append(Level())
+        levels[-1].ball = len(levels) + 2
+      elif section == "level" and "=" not in line:
+        # a row of bricks
+        if any(char not in ".123456789" for char in line):
+          print("Error: \"{}\" line {}: invalid brick row.".format(name, number))
+          return Level_Enum.INVALID_LINE
+        levels[-1].grid.append([0 if char == "." else int(char) for char in line])
+      elif section is not None and "=" in line:
+        key, value = [part.strip() for part in line.split("=", 1)]
+        if not self.set_value(section, levels[-1] if levels else None, key, value):
+          print("Error: \"{}\" line {}: invalid value for {}.".format(name, number, key))
+          return Level_Enum.INVALID_VALUE
+      else:
+        print("Error: \"{}\" line {}: expected [pack] or [level].".format(name, number))
+        return Level_Enum.INVALID_LINE
+    if len(levels) == 0:
+      print("Error: \"{}\" has no levels.".format(name))
+      return Level_Enum.NO_LEVELS
+    for i in range(0,len(levels)):
+      grid = levels[i].grid
+      if len(grid) == 0 or len(grid) > LEVEL_MAX_ROWS or max(len(row) for row in grid) > LEVEL_MAX_COLS:
+        print("Error: \"{}\" level {}: levels must have 1 to {} rows of up to {} bricks.".format(name, i+1, LEVEL_MAX_ROWS, LEVEL_MAX_COLS))
+        return Level_Enum.INVALID_SIZE
+      # a level with no bricks could never be beaten
+      if not any(any(row) for row in grid):
+        print("Error: \"{}\" level {}: levels must have at least one brick.".format(name, i+1))
+        return Level_Enum.INVALID_SIZE
+    self.levels = levels
+    self.compile()
+    return Level_Enum.OKAY
+
+  # set one "key = value" line. returns False if the value isn't valid.
+  def set_value(self, section : str, level : Level, key : str, value : str) -> bool:
+    try:
+      if section == "pack":
+        if key != "win_lives":
+          return False
+        self.win_lives = int(value)
+        return self.win_lives >= 0
+      elif key == "paddle":
+        if value not in ("large", "small"):
+          return False
+        level.paddle = 0 if value == "large" else 1
+      elif key == "lives":
+        level.lives = int(value)
+        return level.lives >= 0
+      elif key == "ball":
+        level.ball = int(value)
+        return level.ball > 1
+      elif key == "motion":
+        level.motion, level.motion_max, level.motion_delay = [int(part) for part in value.split()]
+        if level.motion < 0 or level.motion_max < 0 or level.motion_delay <= 0:
+          return False
+        # the rows turn around when they're exactly max away from the middle, so they have to land on it
+        return level.motion == 0 or level.motion_max % level.motion == 0
+      else:
+        return False
+    except ValueError:
+      return False
+    return True
+
+  # turn every level's grid into one bytes object the size of the brick field
+  def compile(self):
+    self.rows = max(len(level.grid) for level in self.levels)
+    self.cols = max(max(len(row) for row in level.grid) for level in self.levels)
+    for level in self.levels:
+      layout = bytearray(self.rows*self.cols)
+      for row in range(0,len(level.grid)):
+        start = row*self.cols
+        layout[start:start+len(level.grid[row])] = bytes(level.grid[row])
+      level.layout = bytes(layout)
+      level.rows = len(level.grid)
+      level.count = self.cols*self.rows - layout.count(0)
+      level.grid = [] # not needed any more
+
+# packs that have been loaded, stored by file name, so every game using a pack shares it
+packs = {}
+
+# get a level pack, loading it the first time it's asked for.
+# if filename is None, the default levels are used. returns None if the pack couldn't be loaded.
+def load_levels(filename : str = None) -> LevelPack:
+  pack = packs.get(filename)
+  if pack is None:
+    pack = LevelPack()
+    if filename is None:
+      result = pack.parse(DEFAULT_LEVELS, "default levels")
+    else:
+      result = pack.load(filename)
+    if result != Level_Enum.OKAY:
+      return None
+    packs[filename] = pack
+  return pack
@@ -0,0 +1,106 @@
+#!/usr/bin/python3
+
+"""
+Copyright 2024 X Allegretta.
+
+This file is part of py3_bricksmasher.
+py3_bricksmasher is free software: you can redistribute it and/or modify it under the terms
+of the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+py3_bricksmasher is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+You should have received a copy of the GNU Lesser General Public License along with py3_bricksmasher.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# times each part of every frame of the main loop.
+# the last few hundred frames are kept, so it's easy to see where the time goes.
+
+import array
+import time as _time
+
+# the parts of a frame, in the order they happen in the main loop
+class Phase_Enum():
+  RENDER = 0 # drawing the frame
+  FLIP = 1 # pygame.display.flip() or update()
+  EVENTS = 2 # handling input
+  WAIT = 3 # waiting for the next frame in GameClock.tick()
+  PHYSICS = 4 # stepping the game. this includes moving the ball, collisions and moving the rows.
+  UPDATE = 5 # sounds, re-rendering counters and the end-of-game screen
+
+PHASE_NAMES = ("render", "flip", "events", "wait", "physics", "update")
+
+class Profiler:
+  # size is how many frames to keep
+  def __init__(self, size : int = 600):
+    self.size = size
+    self.phases = len(PHASE_NAMES)
+    self.times = array.array("q", bytes(8*size*self.phases)) # nanoseconds spent in each phase of each frame
+    self.frames = 0 # how many frames have been recorded
+    self.slot = 0 # where the current frame starts in times
+    self.last = 0 # when the last phase ended
+    self.enabled = False
+    self.timing = False # whether or not a frame is being timed. turning the profiler on only takes effect at the next begin().
+
+  def toggle(self):
+    self.enabled = not self.enabled
+
+  # start timing a frame
+  def begin(self):
+    self.timing = self.enabled
+    if not self.timing:
+      return
+    self.slot = self.frames%self.size*self.phases
+    for i in range(self.phases):
+      self.times[self.slot+i] = 0
+    self.last = _time.perf_counter_ns()
+
+  # the time since the last mark (or since begin()) was spent in phase
+  def mark(self, phase : int):
+    if not self.timing:
+      return
+    now = _time.perf_counter_ns()
+    self.times[self.slot+phase] += now - self.last
+    self.last = now
+
+  def end(self):
+    if not self.timing:
+      return
+    self.frames += 1
+
+  # the time of each phase of every kept frame, oldest first, in nanoseconds
+  def rows(self) -> list:
+    count = min(self.frames, self.size)
+    first = self.frames - count
+    return [self.times[i%self.size*self.phases:i%self.size*self.phases+self.phases] for i in range(first, self.frames)]
+
+  # a few lines about the kept frames: fps, frame times and how long each phase takes on average
+  def report(self) -> str:
+    rows = self.rows()
+    if len(rows) == 0:
+      return "no frames yet."
+    totals = sorted(sum(row) for row in rows)
+    mean = sum(totals)/len(totals)
+    lines = [
+      "fps: {:.1f}".format(1e9/mean if mean > 0 else 0),
+      "frame p50: {:.2f}ms p99: {:.2f}ms".format(totals[len(totals)//2]/1e6, totals[min(len(totals)-1, len(totals)*99//100)]/1e6),
+    ]
+    for i in range(self.phases):
+      lines.append("{:8} {:6.2f}ms".format(PHASE_NAMES[i] + ":", sum(row[i] for row in rows)/len(rows)/1e6))
+    return "\n".join(lines)
+
+  # save every kept frame as csv, with the time of each phase in microseconds.
+  # returns False if the file couldn't be opened.
+  def save_csv(self, filename : str) -> bool:
+    try:
+      f = open(filename, "w")
+    except OSError:
+      print("Error: Failed to open \"" + filename + "\".")
+      return False
+    f.write("frame," + ",".join(name + "_us" for name in PHASE_NAMES) + ",total_us\n")
+    first = self.frames - min(self.frames, self.size)
+    for i, row in enumerate(self.rows()):
+      f.write(str(first+i) + "," + ",".join("{:.1f}".format(t/1000) for t in row) + ",{:.1f}\n".format(sum(row)/1000))
+    f.close()
+    return True
@@ -15,8 +15,33 @@ If not, see <https://www.gnu.org/licenses/>.
 """
 
 import os
-os.environ['PYGAME_HIDE_SUPPORT_PROMPT']="bluh." # disable pygame's welcome message.
-import pygame
+import collections
+
+# pygame is only needed to render text, so it isn't imported until something is rendered.
+# this keeps tools that only load, edit or save fonts from paying for pygame's startup.
+_pygame = None
+
+def _import_pygame():
+  global _pygame
+  if _pygame is None:
+    os.environ['PYGAME_HIDE_SUPPORT_PROMPT']="bluh." # disable pygame's welcome message.
+    import pygame
+    _pygame = pygame
+  return _pygame
+
+# numpy is optional. with it, text is drawn a whole string at a time instead of glyph by glyph.
+# False means it has been looked for and isn't installed.
+_numpy = None
+
+def _import_numpy():
+  global _numpy
+  if _numpy is None:
+    try:
+      import numpy
+      _numpy = numpy
+    except ImportError:
+      _numpy = False
+  return _numpy
 
 class PSF_Enum():
   OKAY = 0
@@ -28,14 +53,56 @@ class PSF_Enum():
   INVALID_SCALE = 6
   INVALID_INDEX = 7
 
+# how lines in a block of text are lined up
+class Align_Enum():
+  LEFT = 0
+  CENTER = 1
+  RIGHT = 2
+
+# psf1 header values
+PSF1_MAGIC = b"\x36\x04"
+PSF1_MODE512 = 0x01 # font has 512 glyphs instead of 256
+PSF1_MODEHASTAB = 0x02 # font has a unicode table
+PSF1_MODESEQ = 0x04 # font has a unicode table with sequences
+PSF1_SEPARATOR = 0xFFFF # ends the entries for one glyph in a psf1 unicode table
+PSF1_STARTSEQ = 0xFFFE # starts a sequence in a psf1 unicode table
+# psf2 header values
+PSF2_MAGIC = b"\x72\xb5\x4a\x86"
+PSF2_HAS_UNICODE_TABLE = 0x01
+PSF2_SEPARATOR = 0xFF # ends the entries for one glyph in a psf2 unicode table
+PSF2_STARTSEQ = 0xFE # starts a sequence in a psf2 unicode table
+
 # "PC Screen Font" class.
+# supports psf1 (256 or 512 glyphs, 8 pixels wide) and psf2 (any number of glyphs, any width),
+# with or without a unicode table.
 class PSF:
   def __init__(self, warn : bool = True):
     self.data = [] # will store the data for each glyph.
     self.height = 0 # will store the height of each character
+    self.width = 8 # will store the width of each character
+    self.row_size = 1 # how many bytes each row of a glyph takes up
+    self.version = 1 # 1 for a psf1, 2 for a psf2
+    self.unicode = {} # glyph index for each character, if the font has a unicode table
+    self.sequences = {} # glyph index for each sequence of characters in the unicode table
+    self.unicode_table = b"" # the unicode table, exactly as it was loaded
     self.scale = 0 # will store the height to scale to
     self.warn = warn # whether or not to print error messages
     self.alter_scale = True # whether or not to alter scale when loading a new font
+    self.mask = None # every glyph drawn in white, used to make atlases
+    self.glyphs = None # every glyph in one numpy array, used to draw whole strings at once
+    self.atlas = {} # every glyph drawn in one color and scale, stored by (r, g, b, a, scale)
+    self.cache = collections.OrderedDict() # recently rendered strings, stored by (text, r, g, b, a, scale)
+    self.cache_size = 256 # how many rendered strings to keep
+    self.blocks = collections.OrderedDict() # recently laid out blocks of text, stored by everything used to make them
+    self.blocks_size = 32 # how many blocks of text to keep
+
+  # throw away everything rendered with the old glyphs or scale
+  def clearCache(self):
+    self.mask = None
+    self.glyphs = None
+    self.atlas.clear()
+    self.cache.clear()
+    self.blocks.clear()
 
   def loadFont(self, filename : str) -> int:
     f = 0
@@ -45,42 +112,134 @@ class PSF:
       if self.warn:
         print("Error: Failed to open \"" + filename + "\".")
       return PSF_Enum.OPEN_FILE
+    # read the whole file at once. the glyphs are all slices of this one buffer.
+    buffer = memoryview(f.read())
+    f.close()
     # get magic (file type identification) bytes.
     # for a psf1, these should always be 0x36 and 0x04.
-    bytes = f.read(2)
-    if bytes[0] != 0x36 or bytes[1] != 0x04:
+    if buffer[:2] == PSF1_MAGIC and len(buffer) >= 4:
+      # get mode byte.
+      mode = buffer[2]
+      if mode & ~(PSF1_MODE512 | PSF1_MODEHASTAB | PSF1_MODESEQ):
+        if self.warn:
+          print("Error: \"" + filename + "\" is not the correct mode.")
+        return PSF_Enum.INVALID_MODE
+      length = 512 if mode & PSF1_MODE512 else 256
+      has_table = mode & (PSF1_MODEHASTAB | PSF1_MODESEQ) != 0
+      # read the height of each glyph.
+      # for a psf1, each glyph is stored as <height> bytes, with each byte representing one row of 8 pixels.
+      height = buffer[3]
+      width = 8
+      header_size = 4
+      version = 1
+    elif buffer[:4] == PSF2_MAGIC and len(buffer) >= 32:
+      # the rest of the psf2 header is 7 little-endian 32-bit numbers
+      header = [int.from_bytes(buffer[i:i+4], "little") for i in range(4, 32, 4)]
+      header_size = header[1]
+      has_table = header[2] & PSF2_HAS_UNICODE_TABLE != 0
+      length = header[3]
+      height = header[5]
+      width = header[6]
+      version = 2
+      # each row of a psf2 glyph is padded to a whole number of bytes
+      if header[4] != height*((width+7)//8):
+        if self.warn:
+          print("Error: \"" + filename + "\" has an invalid glyph size.")
+        return PSF_Enum.INVALID_PSF
+      # the header can't be shorter than the fields above, and there has to be at least one glyph
+      if header_size < 32 or length == 0:
+        if self.warn:
+          print("Error: \"" + filename + "\" has an invalid header.")
+        return PSF_Enum.INVALID_PSF
+    else:
       if self.warn:
-        print("Error: \"" + filename + "\" is not a valid PSF1 file.")
-      f.close()
+        print("Error: \"" + filename + "\" is not a valid PSF file.")
       return PSF_Enum.INVALID_PSF
-    # get mode byte.
-    # i'm only supporting fonts with 256 glyphs and no unicode table, so this should always be 0.
-    bytes = f.read(1)
-    if bytes[0] != 0:
-      if self.warn:
-        print("Error: \"" + filename + "\" is not the correct mode.")
-        print("Only PSF1s with 256 glyphs and no unicode table are supported.")
-      f.close()
-      return PSF_Enum.INVALID_MODE
-    # read the height of each glyph.
-    bytes = f.read(1)
-    if bytes[0] < 1:
+    if height < 1 or width < 1:
       if self.warn:
         print("Error: \"" + filename + "\" has invalid glyph height.")
-      f.close()
-      return PSF_Enum.INVLID_HEIGHT
-    self.height = bytes[0]
+      return PSF_Enum.INVALID_HEIGHT
+    row_size = (width+7)//8
+    glyph_size = height*row_size
+    table_start = header_size + length*glyph_size
+    if len(buffer) < table_start:
+      if self.warn:
+        print("Error: \"" + filename + "\" is too short.")
+      return PSF_Enum.INVALID_PSF
+
+    self.height = height
+    self.width = width
+    self.row_size = row_size
+    self.version = version
     if self.alter_scale:
       self.scale = self.height
     # read the actual font data.
     self.data.clear()
-    for i in range(0,256): # for each glyph
-      # for a psf1, each glyph is stored as <height> bytes, with each byte representing one row of 8 pixels.
-      # each bit in each byte represents one pixel.
-      self.data.append(f.read(self.height))
-    f.close()
+    for i in range(0,length): # for each glyph
+      start = header_size + i*glyph_size
+      self.data.append(buffer[start:start+glyph_size])
+    # read the unicode table
+    self.unicode = {}
+    self.sequences = {}
+    self.unicode_table = buffer[table_start:] if has_table else b""
+    if has_table:
+      if version == 1:
+        self.readTable1(self.unicode_table)
+      else:
+        self.readTable2(self.unicode_table)
+    self.clearCache()
     return PSF_Enum.OKAY
 
+  # add a character or sequence from a unicode table to the map
+  def addUnicode(self, chars : list, index : int):
+    if len(chars) == 1:
+      self.unicode.setdefault(chars[0], index)
+    elif len(chars) > 1:
+      self.sequences.setdefault("".join(chars), index)
+
+  # psf1 unicode tables are little-endian 16-bit numbers.
+  # each glyph has a list of characters, then any sequences (each starting with PSF1_STARTSEQ),
+  # then PSF1_SEPARATOR.
+  def readTable1(self, table):
+    index = 0
+    chars = []
+    in_seq = False
+    for i in range(0, len(table)-1, 2):
+      value = table[i] | table[i+1] << 8
+      if value == PSF1_SEPARATOR:
+        if in_seq:
+          self.addUnicode(chars, index)
+        chars = []
+        in_seq = False
+        index += 1
+        if index >= len(self.data):
+          break
+      elif value == PSF1_STARTSEQ:
+        if in_seq:
+          self.addUnicode(chars, index)
+        chars = []
+        in_seq = True
+      elif in_seq:
+        chars.append(chr(value))
+      else:
+        self.addUnicode([chr(value)], index)
+
+  # psf2 unicode tables are utf-8.
+  # each glyph has a string of characters, then any sequences (each starting with PSF2_STARTSEQ),
+  # then PSF2_SEPARATOR.
+  def readTable2(self, table):
+    table = bytes(table)
+    index = 0
+    for entry in table.split(bytes([PSF2_SEPARATOR])):
+      if index >= len(self.data):
+        break
+      parts = entry.split(bytes([PSF2_STARTSEQ]))
+      for char in parts[0].decode("utf-8", "replace"):
+        self.addUnicode([char], index)
+      for seq in parts[1:]:
+        self.addUnicode(list(seq.decode("utf-8", "replace")), index)
+      index += 1
+
   def setScale(self, scale : int) -> int:
     if scale < 1:
       if self.warn:
@@ -88,24 +247,44 @@ class PSF:
       return PSF_Enum.INVALID_SCALE
     self.scale=scale
     self.alter_scale = False
+    self.cache.clear()
+    self.blocks.clear()
     return PSF_Enum.OKAY
 
   def getHeight(self) -> int:
     return self.height
 
+  def getWidth(self) -> int:
+    return self.width
+
+  # number of glyphs in the font
+  def getLength(self) -> int:
+    return len(self.data)
+
+  # get which glyph is used to draw a character.
+  # without a unicode table, characters map straight to glyphs, like they always have.
+  # characters with no glyph are drawn with "?", or glyph 0 if there isn't one either.
+  def getGlyphIndex(self, char : str) -> int:
+    if self.unicode:
+      index = self.unicode.get(char)
+      if index is None:
+        index = self.unicode.get("?", 0)
+      return index
+    index = ord(char)
+    if index >= len(self.data):
+      index = ord("?") if ord("?") < len(self.data) else 0
+    return index
+
   def getGlyph(self, index : int) -> bytes:
     if self.height == 0:
       if self.warn:
         print("Error: No font exists.")
       return b"\0"
 
-    if index < 0 or index > 255:
+    if index < 0 or index >= len(self.data):
       if self.warn:
         print("Error: Invalid glyph index.")
-      buffer = bytearray()
-      for i in range(0,self.height):
-        buffer.append(0)
-      return bytes(buffer)
+      return bytes(self.height*self.row_size)
 
     return self.data[index]
 
@@ -122,25 +301,39 @@ class PSF:
       if self.warn:
         print("Error: Failed to open \"" + filename + "\".")
       return PSF_Enum.OPEN_FILE
-    # write header
-    f.write(bytes([0x36, 0x04, 0, self.height]))
+    # write header, in the same format the font was loaded in
+    if self.version == 1:
+      mode = 0
+      if len(self.data) == 512:
+        mode |= PSF1_MODE512
+      if self.unicode_table:
+        mode |= PSF1_MODEHASTAB
+        if self.sequences:
+          mode |= PSF1_MODESEQ
+      f.write(bytes([0x36, 0x04, mode, self.height]))
+    else:
+      flags = PSF2_HAS_UNICODE_TABLE if self.unicode_table else 0
+      header = [0, 32, flags, len(self.data), self.height*self.row_size, self.height, self.width]
+      f.write(PSF2_MAGIC + b"".join(value.to_bytes(4, "little") for value in header))
     # write font data
-    for i in range(0,256):
-      f.write(self.data[i])
+    for glyph in self.data:
+      f.write(glyph)
+    f.write(self.unicode_table)
     # end
     f.close()
     return PSF_Enum.OKAY
 
   def setGlyph(self, index : int, glyph : bytes) -> int:
-    if len(glyph) != self.height:
+    if len(glyph) != self.height*self.row_size:
       if self.warn:
         print("Error: Invalid glyph height!")
       return PSF_Enum.INVALID_HEIGHT
-    if index < 1 or index > 255:
+    if index < 1 or index >= len(self.data):
       if self.warn:
         print("Error: Invalid glyph index!")
       return PSF_Enum.INVALID_INDEX
-    self.data[index] = glyph
+    self.data[index] = bytes(glyph)
+    self.clearCache()
     return PSF_Enum.OKAY
 
   def newFont(self, height : int) -> int:
@@ -150,53 +343,236 @@ class PSF:
       return PSF_Enum.INVALID_HEIGHT
     # set height + scale
     self.height = height
+    self.width = 8
+    self.row_size = 1
+    self.version = 1
+    self.unicode = {}
+    self.sequences = {}
+    self.unicode_table = b""
     if self.alter_scale:
       self.scale = height
     # create byte buffer of one empty glyph
-    buffer = bytearray()
-    for i in range(0,height):
-      buffer.append(0x00)
-    buffer = bytes(buffer) # convert to immutable bytes
+    buffer = bytes(height)
     # make data contain empty glyphs
     self.data.clear()
     for i in range(0,256): # for each glyph
       self.data.append(buffer)
+    self.clearCache()
     return PSF_Enum.OKAY
 
-  # convert a string into pygame image using the font
-  def render(self, text : str, r=255, g=255, b=255, a=255) -> pygame.image:
+  # draw every glyph in white into a grid 16 glyphs wide.
+  # this is the only place the glyphs are turned into pixels one at a time.
+  def getMask(self) -> "pygame.Surface":
+    pygame = _import_pygame()
+    if self.mask is None:
+      # the pixels for each possible byte of a row of a glyph
+      pixels = []
+      for byte in range(0,256):
+        row = bytearray()
+        bit = 0x80
+        while bit>0:
+          # white if pixel is active, transparent if it isn't
+          row += b"\xff\xff\xff\xff" if byte & bit == bit else b"\0\0\0\0"
+          bit >>= 1
+        pixels.append(bytes(row))
+      width = self.width*4 # bytes of pixels in a row of one glyph
+      blank = bytes(self.height*self.row_size)
+      grid_h = (len(self.data)+15)//16
+      buffer = bytearray()
+      for gy in range(0,grid_h): # rows of glyphs
+        glyphs = self.data[gy*16:gy*16+16]
+        glyphs += [blank]*(16-len(glyphs))
+        for y in range(0,self.height): # rows of pixels
+          start = y*self.row_size
+          for glyph in glyphs: # columns of glyphs
+            if self.row_size == 1:
+              buffer += pixels[glyph[start]]
+            else:
+              row = b"".join(pixels[byte] for byte in glyph[start:start+self.row_size])
+              buffer += row[:width]
+      self.mask = pygame.image.fromstring(bytes(buffer), (16*self.width, grid_h*self.height), "RGBA")
+    return self.mask
+
+  # get all of the glyphs drawn in one color and scale.
+  # returns the atlas and the size of each glyph in it.
+  def getAtlas(self, r : int, g : int, b : int, a : int, scale : int):
+    pygame = _import_pygame()
+    key = (r, g, b, a, scale)
+    if key not in self.atlas:
+      atlas = self.getMask().copy()
+      atlas.fill((r, g, b, a), special_flags=pygame.BLEND_RGBA_MULT)
+      if scale != self.height:
+        atlas = pygame.transform.scale(atlas, (16*self.width*scale//self.height, atlas.get_height()//self.height*scale))
+      self.atlas[key] = atlas
+    atlas = self.atlas[key]
+    return atlas, atlas.get_width()//16, scale
+
+  # convert a string into pygame image using the font.
+  # recently rendered strings are cached, so the image returned might be shared.
+  # copy it before changing it (with set_alpha(), for example).
+  def render(self, text : str, r=255, g=255, b=255, a=255) -> "pygame.Surface":
+    pygame = _import_pygame()
     # don't do anything if no font has been loaded.
     if self.height == 0:
       if self.warn:
         print("Error: No font has been loaded.")
       return pygame.image.fromstring(b"\0\0\0\0", (1, 1), "RGBA")
 
-    buffer = bytearray()
-    for y in range(0,self.height): # loop through all of the rows of the text
-      for x in range(0,len(text)): # loop through all of the characters in the string
-        row = self.data[ord(text[x])][y]
-        # for each pixel in the row
-        bit = 0x80
-        while bit>0:
-          # if pixel is active, add a pixel of the specified color
-          if row & bit == bit:
-            buffer.append(r)
-            buffer.append(g)
-            buffer.append(b)
-            buffer.append(a)
-          # if pixel isn't active, add a transparent pixel
-          else:
-            for i in range(0,4):
-              buffer.append(0)
-          bit >>= 1
+    key = (text, r, g, b, a, self.scale)
+    image = self.cache.get(key)
+    if image is not None:
+      self.cache.move_to_end(key)
+      return image
+
+    image = self.renderArray(text, r, g, b, a)
+    if image is None:
+      image = self.renderAtlas(text, r, g, b, a)
 
-    # convert the byte buffer to a pygame image
-    image = pygame.image.fromstring(bytes(buffer), (len(text)*8, self.height), "RGBA")
-    # pygame.image.fromstring(buffer, (w,h), format)
+    self.cache[key] = image
+    if len(self.cache) > self.cache_size:
+      self.cache.popitem(False)
+    return image
+
+  # draw a string by copying each glyph from an atlas.
+  def renderAtlas(self, text : str, r : int, g : int, b : int, a : int) -> "pygame.Surface":
+    pygame = _import_pygame()
+    # glyphs can only be copied at the final scale if they are a whole number of pixels wide.
+    # if they aren't, the text is put together at the normal size and then scaled.
+    scale = self.scale
+    if self.width*scale % self.height != 0:
+      scale = self.height
+    atlas, w, h = self.getAtlas(r, g, b, a, scale)
+
+    # copy each glyph from the atlas
+    image = pygame.Surface((len(text)*w, h), pygame.SRCALPHA)
+    blits = []
+    for x in range(0,len(text)): # loop through all of the characters in the string
+      index = self.getGlyphIndex(text[x])
+      blits.append((atlas, (x*w, 0), (index%16*w, index//16*h, w, h), pygame.BLEND_RGBA_MAX))
+    image.blits(blits, False)
 
     # scale the image to a new height
-    if self.scale != self.height:
+    if scale != self.scale:
       # pygame.transform.scale(image, (new_w, new_h))
-      image = pygame.transform.scale(image, (int(len(text)*8*self.scale/self.height), self.scale))
+      image = pygame.transform.scale(image, (int(len(text)*self.width*self.scale/self.height), self.scale))
 
     return image
+
+  # draw a whole string at once with numpy.
+  # the rows of every glyph in the string are unpacked into one bitmap, which is turned into pixels in one go.
+  # returns None if numpy isn't installed.
+  def renderArray(self, text : str, r : int, g : int, b : int, a : int) -> "pygame.Surface":
+    np = _import_numpy()
+    if not np:
+      return None
+    pygame = _import_pygame()
+    if len(text) == 0:
+      return pygame.Surface((0, self.scale), pygame.SRCALPHA)
+    if self.glyphs is None:
+      self.glyphs = np.frombuffer(b"".join(self.data), np.uint8).reshape(len(self.data), self.height, self.row_size)
+    indices = np.fromiter((self.getGlyphIndex(char) for char in text), np.intp, len(text))
+    # (characters, rows, bits) -> (rows, characters*bits)
+    bits = np.unpackbits(self.glyphs[indices], axis=2)[:, :, :self.width]
+    bits = bits.transpose(1, 0, 2).reshape(self.height, len(text)*self.width)
+    # the color, as one 32-bit number laid out as RGBA in memory
+    color = np.array([r, g, b, a], np.uint8).view(np.uint32)[0]
+    # when the scale is a whole multiple of the height, each pixel is just repeated
+    factor = self.scale//self.height
+    if factor > 1 and self.scale % self.height == 0:
+      bits = bits.repeat(factor, axis=0).repeat(factor, axis=1)
+    pixels = bits.astype(np.uint32)*color
+    # the surface uses the array's memory directly instead of copying it
+    image = pygame.image.frombuffer(pixels, (pixels.shape[1], pixels.shape[0]), "RGBA")
+    if image.get_height() != self.scale:
+      # pygame.transform.scale(image, (new_w, new_h))
+      image = pygame.transform.scale(image, (int(len(text)*self.width*self.scale/self.height), self.scale))
+    return image
+
+  # split text into lines. lines are split at newlines, and at spaces if they are wider than width pixels.
+  # words that are wider than width by themselves are split wherever they need to be.
+  # if width is 0, lines are only split at newlines.
+  def wrapText(self, text : str, width : int = 0) -> list:
+    max_chars = width*self.height//(self.width*self.scale)
+    lines = []
+    for paragraph in text.split("\n"):
+      if max_chars < 1 or len(paragraph) <= max_chars:
+        lines.append(paragraph)
+        continue
+      line = ""
+      for word in paragraph.split(" "):
+        if len(line) > 0 and len(line) + 1 + len(word) <= max_chars:
+          line += " " + word
+          continue
+        if len(line) > 0:
+          lines.append(line)
+        while len(word) > max_chars:
+          lines.append(word[:max_chars])
+          word = word[max_chars:]
+        line = word
+      lines.append(line)
+    return lines
+
+  # lay out a block of text and draw it onto one surface, so it only takes one blit to draw.
+  # text can have newlines, and is wrapped to width pixels if width isn't 0.
+  # lines are lined up to width, or to the longest line if width is 0.
+  # color is either one (r, g, b, a) for the whole block, or a list with one for each line.
+  # line_height is how far apart the tops of lines are, or 0 for no space between them.
+  # blocks are cached, so the same block is only laid out once.
+  def renderBlock(self, text : str, width : int = 0, align : int = Align_Enum.LEFT, color=(255, 255, 255, 255), line_height : int = 0) -> "TextBlock":
+    pygame = _import_pygame()
+    if line_height < 1:
+      line_height = self.scale
+    # colors can be lists, so they're turned into tuples to use them in the key
+    if isinstance(color[0], (tuple, list)):
+      color = tuple(tuple(line_color) for line_color in color)
+    else:
+      color = tuple(color)
+    key = (text, width, align, color, line_height, self.scale)
+    block = self.blocks.get(key)
+    if block is not None:
+      self.blocks.move_to_end(key)
+      return block
+
+    lines = self.wrapText(text, width)
+    images = []
+    for i in range(0,len(lines)):
+      line_color = color[i%len(color)] if isinstance(color[0], (tuple, list)) else color
+      images.append(self.render(lines[i], *line_color))
+    block_w = width
+    if block_w < 1:
+      block_w = max(image.get_width() for image in images)
+    # position each line
+    rects = []
+    for i in range(0,len(images)):
+      rect = images[i].get_rect()
+      rect.y = i*line_height
+      if align == Align_Enum.CENTER:
+        rect.x = (block_w - rect.w)//2
+      elif align == Align_Enum.RIGHT:
+        rect.x = block_w - rect.w
+      rects.append(rect)
+    # draw every line at once
+    image = pygame.Surface((block_w, (len(lines)-1)*line_height + self.scale), pygame.SRCALPHA)
+    image.blits([(images[i], rects[i], None, pygame.BLEND_RGBA_MAX) for i in range(0,len(images))], False)
+    block = TextBlock(image, lines, rects, self.width*self.scale/self.height, self.scale)
+
+    self.blocks[key] = block
+    if len(self.blocks) > self.blocks_size:
+      self.blocks.popitem(False)
+    return block
+
+# a laid out block of text, made by PSF.renderBlock().
+# like rendered strings, blocks are shared, so copy the image before changing it.
+class TextBlock:
+  def __init__(self, image : "pygame.Surface", lines : list, rects : list, glyph_w : float, glyph_h : int):
+    self.image = image # every line drawn onto one surface
+    self.lines = lines # the text of each line, after wrapping
+    self.rects = rects # where each line is in image
+    self.glyph_w = glyph_w # size of each character in image. the width can be a fraction of a pixel.
+    self.glyph_h = glyph_h
+
+  # where a character is in image, given its line and its position in that line
+  def glyphRect(self, line : int, index : int) -> "pygame.Rect":
+    rect = self.rects[line]
+    x = rect.x + int(index*self.glyph_w)
+    return _import_pygame().Rect(x, rect.y, rect.x + int((index+1)*self.glyph_w) - x, self.glyph_h)
@@ -33,10 +33,26 @@ except:
   print("Error: Invalid glyph index.")
   sys.exit(1)
 
-if glyphnum < 0 or glyphnum > 255:
+if glyphnum < 0:
   print("Error: Invalid glyph index.")
   sys.exit(1)
 
+glyph = 0
+# load font
+font = PSF()
+if font.loadFont(sys.argv[2]) != PSF_Enum.OKAY:
+  font.newFont(16)
+height = font.getHeight()
+width = font.getWidth()
+row_size = (width+7)//8 # bytes in each row of the glyph
+
+# fonts can have more than 256 glyphs, so the index can only be checked once the font is loaded
+if glyphnum >= font.getLength():
+  print("Error: Invalid glyph index.")
+  sys.exit(1)
+
+glyph = bytearray(font.getGlyph(glyphnum))
+
 # start curses
 stdscr = curses.initscr()
 curses.noecho()
@@ -56,16 +72,6 @@ curses.init_pair(3, curses.COLOR_BLACK, curses.COLOR_MAGENTA)
 cur_x=0
 cur_y=0
 
-glyph = 0
-# load font
-font = PSF()
-if font.loadFont(sys.argv[2]) != PSF_Enum.OKAY:
-  font.newFont(16)
-  height = 16
-else:
-  height = font.getHeight()
-
-glyph = bytearray(font.getGlyph(glyphnum))
 
 save = False
 
@@ -74,10 +80,10 @@ while run:
   stdscr.move(0,0)
 
   for y in range(0,height):
-    for x in range(0,8):
+    for x in range(0,width):
       pair=0
       char = "~"
-      if (glyph[y] >> (7-x)) & 1 == 1:
+      if (glyph[y*row_size+x//8] >> (7-x%8)) & 1 == 1:
         char = " "
         pair = 1
       if x==cur_x and y==cur_y:
@@ -103,10 +109,10 @@ while run:
     if cur_x>0:
       cur_x-=1
   elif c == "KEY_RIGHT":
-    if cur_x<7:
+    if cur_x<width-1:
       cur_x+=1
   elif c == " ":
-    glyph[cur_y] ^= (1 << (7-cur_x))
+    glyph[cur_y*row_size+cur_x//8] ^= (1 << (7-cur_x%8))
 
 # save font
 if save:
@@ -0,0 +1,319 @@
+#!/usr/bin/python3
+
+"""
+Copyright 2024 X Allegretta.
+
+This file is part of py3_bricksmasher.
+py3_bricksmasher is free software: you can redistribute it and/or modify it under the terms
+of the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+py3_bricksmasher is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+You should have received a copy of the GNU Lesser General Public License along with py3_bricksmasher.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# draws a Game onto a pygame surface.
+
+import os
+os.environ['PYGAME_HIDE_SUPPORT_PROMPT']="bluh." # disable pygame's welcome message.
+import pygame
+from psf import *
+from game import *
+from tint import *
+from assets import *
+from transition import *
+
+class Renderer:
+  # if dirty is True, only the parts of the screen that changed are drawn.
+  # draw() then returns the list of rects to pass to pygame.display.update().
+  # scale is the size of win compared to the playfield. everything is drawn at that size.
+  # if fade_region is True, fades only cover the counters, bricks and message instead of the whole screen.
+  def __init__(self, win : pygame.Surface, game : Game, dirty : bool = False, scale : float = 1.0, fade_region : bool = False):
+    self.dirty = dirty
+    self.fade_region = fade_region
+    self.fade = Fade() # fades out the old screen behind the next level / game over text
+    self.fade_rect = None # where the fade was drawn last frame, so it can be erased in dirty mode
+    self.replay_fade = Fade() # fades out the game at the start of the end-of-game screen
+    self.static_key = None # what the bricks in static were drawn from
+    self.hud_changed = True
+    self.prev_ball = None # where the ball was before the last tick, used to smooth its movement
+    self.prev_ticks = 1 # how many ticks the ball has moved since prev_ball
+    self.font = PSF()
+    self.font.loadFont("game.psf")
+    self.overlay_font = None # smaller font for the profiler's overlay, loaded the first time it's shown
+    self.set_target(win, game, scale)
+
+  # start drawing on a different surface, at a different scale (after the window changes size, for example)
+  def set_target(self, win : pygame.Surface, game : Game, scale : float = 1.0):
+    self.win = win
+    self.win_rect = win.get_rect()
+    self.scale = scale
+    self.static = pygame.Surface(self.win_rect.size) # background, bricks and counters, for dirty mode
+    self.static_level = 0 # which background is in static
+    self.full_redraw = True # whether or not the whole screen needs to be drawn next frame
+    self.sprite_rects = [] # where the paddle and ball were drawn last frame
+    # all of the images, converted to the window's pixel format and scaled
+    self.assets = load_assets(scale=scale)
+    self.paddle_img = [self.assets.paddle(i) for i in range(0,2)]
+    self.ball_img = self.assets.ball
+
+    self.font.setScale(round(40*scale))
+    # next level / game over text. these are copied since their alpha is changed to fade them out.
+    self.msg_img = [self.font.render("level beaten.").copy(), self.font.render("game over.").copy(), self.font.render(" ").copy()]
+    self.msg_rect = [0, 0, 0]
+    for i in range(0, 3):
+      self.msg_rect[i] = self.msg_img[i].get_rect()
+      self.msg_rect[i].x = self.win_rect.w/2 - self.msg_rect[i].w/2
+      self.msg_rect[i].y = self.win_rect.h/2 - self.msg_rect[i].h/2
+    self.msg_type = -1 # no message to start with. one that was fading out is dropped, since it's the wrong size now.
+    self.fade.stop()
+    self.fade_rect = None
+    self.replay_fade.stop()
+
+    # build everything that depends on the game's state
+    self.update(game, Game_Enum.COLORS | Game_Enum.LEVEL | Game_Enum.LIVES | Game_Enum.SCORE)
+
+  # re-render anything that was changed by the events from Game.step()
+  def update(self, game : Game, events : int):
+    if events & Game_Enum.COLORS:
+      # one finished brick image for each row
+      self.brick_img = [self.assets.brick(inner, glow) for inner, glow in zip(*game.brick_hues)]
+    # counters at top of screen
+    if events & Game_Enum.LEVEL:
+      self.level_img = self.font.render("level: {:02}".format(game.level))
+      self.level_rect = self.level_img.get_rect()
+      self.level_rect.x = self.win_rect.w/4-self.level_rect.w/2
+      # get the next level's background ready while this one is played
+      self.assets.prefetch_background(game.level % len(game.levels.levels) + 1)
+    if events & Game_Enum.LIVES:
+      self.lives_img = self.font.render("lives: {:02}".format(game.lives))
+      self.lives_rect = self.lives_img.get_rect()
+      self.lives_rect.x = self.win_rect.w/2-self.lives_rect.w/2
+    if events & Game_Enum.SCORE:
+      self.score_img = self.font.render("score: {:06}".format(game.score))
+      self.score_rect = self.score_img.get_rect()
+      self.score_rect.x = self.win_rect.w*3/4-self.score_rect.w/2
+    if events & (Game_Enum.LEVEL | Game_Enum.LIVES | Game_Enum.SCORE):
+      # put the counters together into one image, so they only take one blit to draw
+      self.hud_rect = self.level_rect.union(self.lives_rect).union(self.score_rect)
+      self.hud_img = pygame.Surface(self.hud_rect.size, pygame.SRCALPHA)
+      self.hud_img.blits([(img, rect.move(-self.hud_rect.x, -self.hud_rect.y), None, pygame.BLEND_RGBA_MAX)
+        for img, rect in ((self.level_img, self.level_rect), (self.lives_img, self.lives_rect), (self.score_img, self.score_rect))], False)
+      if pygame.display.get_surface() is not None:
+        self.hud_img = self.hud_img.convert_alpha()
+      self.hud_changed = True
+    # messages
+    if events & Game_Enum.GAME_OVER:
+      self.show_message(game, 1)
+    elif events & Game_Enum.GAME_WON:
+      self.show_message(game, 2) # doesn't actually show a message, but makes it so that there's a fade
+    elif events & Game_Enum.LEVEL_BEATEN:
+      self.show_message(game, 0)
+
+  # fade out the current screen while showing a message
+  def show_message(self, game : Game, msg_type : int):
+    if self.msg_type > -1:
+      self.msg_img[self.msg_type].set_alpha(255)
+    self.msg_type = msg_type
+    region = None
+    if self.fade_region:
+      # from the top of the screen to the bottom of the bricks, and the message
+      region = pygame.Rect((0, 0), self.at(WIN_W, BRICK_Y + game.bricks.rows*(BRICK_H+BRICK_GAP)))
+      region.w = self.win_rect.w
+      region.union_ip(self.msg_rect[msg_type])
+    self.fade.start(self.win, region)
+
+  # remember where the ball is before stepping the game, so that draw() can draw it part of the way
+  # between the last two ticks when frames and ticks don't line up.
+  # ticks is how many ticks the next step moves the game (more than one for a swept step).
+  def save_positions(self, game : Game, ticks : int = 1):
+    self.prev_ball = (game.ball_x, game.ball_y)
+    self.prev_ticks = ticks
+
+  # where to draw the ball, alpha of the way from where it was before the last tick to where it is now
+  def ball_pos(self, game : Game, alpha : float) -> tuple:
+    x = game.ball_x
+    y = game.ball_y
+    if self.prev_ball is not None:
+      prev_x, prev_y = self.prev_ball
+      dx = x - prev_x
+      dy = y - prev_y
+      if self.prev_ticks > 1:
+        # a swept step moves the ball several ticks at once, so only smooth over the last of them
+        dx /= self.prev_ticks
+        dy /= self.prev_ticks
+        prev_x = x - dx
+        prev_y = y - dy
+      # don't smooth out the ball being put back on the paddle
+      if abs(dx) <= BALL_SIZE and abs(dy) <= BALL_SIZE:
+        x = prev_x + int(dx*alpha)
+        y = prev_y + int(dy*alpha)
+    return (x-BALL_IMG_OFFSET, y-BALL_IMG_OFFSET)
+
+  # turn a position on the playfield into one on win
+  def at(self, x, y) -> tuple:
+    if self.scale == 1:
+      return (x, y)
+    return (int(x*self.scale), int(y*self.scale))
+
+  def background(self, game : Game) -> pygame.Surface:
+    return self.assets.background(game.level)
+
+  # make the next frame draw the whole screen (after the window changes, for example)
+  def invalidate(self):
+    self.full_redraw = True
+
+  def draw_bricks(self, surf : pygame.Surface, game : Game):
+    blits = []
+    y = BRICK_Y
+    for i in range(0, game.rows):
+      x = game.row_x(i)
+      for j in range(0, game.bricks.cols):
+        if game.bricks.get(i, j): # only if the brick exists
+          blits.append((self.brick_img[i], self.at(x, y), None, pygame.BLEND_PREMULTIPLIED))
+        x += BRICK_W+BRICK_GAP
+      y += BRICK_H+BRICK_GAP
+    surf.blits(blits, False)
+
+  # level, lives and score counters
+  def draw_hud(self, surf : pygame.Surface):
+    surf.blit(self.hud_img, self.hud_rect)
+
+  # bring the background, bricks and counters in self.static up to date.
+  # returns the rects of static that changed, or None if all of it did.
+  def update_static(self, game : Game):
+    static = self.static
+    background = self.background(game)
+    brick_key = (game.bricks.version, game.row_offset, game.rows, self.brick_img)
+    if game.level != self.static_level:
+      self.static_level = game.level
+      self.static_key = brick_key
+      self.hud_changed = False
+      static.blit(background, (0, 0))
+      self.draw_bricks(static, game)
+      self.draw_hud(static)
+      return None
+    changed = []
+    if brick_key != self.static_key:
+      self.static_key = brick_key
+      band = pygame.Rect(self.at(0, BRICK_Y), self.at(WIN_W, game.bricks.rows*(BRICK_H+BRICK_GAP)))
+      static.blit(background, band, band)
+      self.draw_bricks(static, game)
+      changed.append(band)
+    if self.hud_changed:
+      self.hud_changed = False
+      band = pygame.Rect(0, 0, self.win_rect.w, self.hud_rect.bottom)
+      static.blit(background, band, band)
+      self.draw_hud(static)
+      changed.append(band)
+    return changed
+
+  # draw a frame. alpha is how far between the last tick and the next one this frame is.
+  # returns None if the whole screen was drawn, or a list of the rects that changed.
+  def draw(self, game : Game, alpha : float = 1.0):
+    if self.dirty:
+      changed = self.update_static(game)
+      if changed is not None and not self.full_redraw:
+        if self.fade_rect is not None:
+          changed.append(self.fade_rect) # erase last frame's fade
+        rects = self.draw_dirty(game, changed, alpha)
+        self.fade_rect = self.draw_message()
+        if self.fade_rect is not None:
+          rects.append(self.fade_rect)
+        return rects
+      self.full_redraw = False
+      self.win.blit(self.static, (0, 0))
+      self.sprite_rects = self.draw_sprites(game, alpha)
+    else:
+      self.win.blit(self.background(game), self.win_rect) # draw background
+      self.win.blit(self.paddle_img[game.paddle_index], self.at(game.paddle_x, game.paddle_y)) # paddle
+      self.draw_bricks(self.win, game)
+      self.draw_hud(self.win)
+      # draw ball
+      self.win.blit(self.ball_img[game.ball_img_index], self.at(*self.ball_pos(game, alpha)))
+      self.draw_balls(game)
+    self.fade_rect = self.draw_message()
+    return None
+
+  # draw the paddle and ball. returns where they were drawn.
+  def draw_sprites(self, game : Game, alpha : float) -> list:
+    return [
+      self.win.blit(self.paddle_img[game.paddle_index], self.at(game.paddle_x, game.paddle_y)),
+      self.win.blit(self.ball_img[game.ball_img_index], self.at(*self.ball_pos(game, alpha))),
+    ] + self.draw_balls(game)
+
+  # draw the extra balls in multi-ball mode, all in one call. returns where they were drawn.
+  def draw_balls(self, game : Game) -> list:
+    if not game.balls:
+      return []
+    img = self.ball_img[game.ball_img_index]
+    xs = (game.balls.x - BALL_IMG_OFFSET)
+    ys = (game.balls.y - BALL_IMG_OFFSET)
+    if self.scale != 1:
+      xs = (xs*self.scale).astype(int)
+      ys = (ys*self.scale).astype(int)
+    xs = xs.tolist()
+    ys = ys.tolist()
+    return self.win.blits([(img, (x, y)) for x, y in zip(xs, ys)], self.dirty) or []
+
+  # only redraw what moved or changed since the last frame
+  def draw_dirty(self, game : Game, changed : list, alpha : float) -> list:
+    win = self.win
+    # erase the paddle and ball from last frame, and copy over anything that changed
+    dirty = self.sprite_rects + changed
+    for rect in dirty:
+      win.blit(self.static, rect, rect)
+    self.sprite_rects = self.draw_sprites(game, alpha)
+    return dirty + self.sprite_rects
+
+  # draw the fade and the message over it. returns where the fade was drawn, or None if there isn't one.
+  def draw_message(self) -> pygame.Rect:
+    if self.msg_type == -1:
+      return None
+    rect = self.fade.draw(self.win)
+    if rect is None: # the fade is over
+      self.msg_img[self.msg_type].set_alpha(255)
+      self.msg_type = -1
+      return None
+    # the message fades out along with the old screen
+    img = self.msg_img[self.msg_type]
+    if img.get_alpha() != self.fade.alpha:
+      img.set_alpha(self.fade.alpha)
+    self.win.blit(img, self.msg_rect[self.msg_type])
+    return rect
+
+  # draw a block of text over the top left of the frame, below the counters (the profiler's numbers, for example).
+  # returns the rect it was drawn in, which has to be updated along with the rest of the frame.
+  def draw_overlay(self, text : str) -> pygame.Rect:
+    if self.overlay_font is None:
+      self.overlay_font = PSF()
+      self.overlay_font.loadFont("game.psf")
+      self.overlay_font.setScale(16)
+    block = self.overlay_font.renderBlock(text, color=(255, 255, 0, 255))
+    rect = self.win.blit(block.image, (8, self.hud_rect.bottom + 8))
+    if self.dirty:
+      self.sprite_rects.append(rect) # erase it next frame, like the paddle and ball
+    return rect
+
+  # prepare the end-of-game screen
+  def start_replay(self, game : Game):
+    # the messages to display, laid out evenly down the screen
+    lines = [
+      "you beat the game!",
+      "created by x allegretta.",
+      "your score was {:06}.".format(game.score),
+      "click the mouse or press space to play again.",
+      "press 'q' or escape to quit.",
+    ]
+    line_height = self.win_rect.h//(len(lines)+1)
+    self.replay_info = self.font.renderBlock("\n".join(lines), self.win_rect.w, Align_Enum.CENTER, line_height=line_height)
+    self.replay_info_pos = (0, line_height)
+    self.replay_fade.start(self.win)
+
+  def draw_replay(self):
+    win = self.win
+    win.fill((0, 0, 0)) # clear screen
+    win.blit(self.replay_info.image, self.replay_info_pos)
+    self.replay_fade.draw(win)
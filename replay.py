@@ -0,0 +1,159 @@
+#!/usr/bin/python3
+
+"""
+Copyright 2024 X Allegretta.
+
+This file is part of py3_bricksmasher.
+py3_bricksmasher is free software: you can redistribute it and/or modify it under the terms
+of the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+py3_bricksmasher is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+You should have received a copy of the GNU Lesser General Public License along with py3_bricksmasher.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# records the input given to a game, and plays it back.
+# since everything random in a game comes from its seed, the seed and the input are enough
+# to play the exact same game again, headless and as fast as possible.
+# usage: python3 replay.py <recording> [level pack]
+
+import struct
+import sys
+import time as _time
+from game import *
+
+class Replay_Enum():
+  OKAY = 0
+  OPEN_FILE = 1
+  INVALID_FILE = 2
+  INVALID_VERSION = 3
+  MISMATCH = 4
+
+REPLAY_MAGIC = b"BSRP"
+REPLAY_VERSION = 2
+# magic, version, flags, seed, number of extra balls, then the final ticks, score, level and lives
+REPLAY_HEADER = struct.Struct("<4sBBqIiiii")
+REPLAY_SWEPT = 0x01 # the game used swept collision
+# each step is a paddle x and a count of ticks, with the top bit of the count set if the ball was launched
+REPLAY_STEP = struct.Struct("<hH")
+REPLAY_NO_PADDLE = -32768 # paddle x for steps where the paddle didn't move
+REPLAY_LAUNCH = 0x8000
+REPLAY_MAX_TICKS = 0x7fff
+
+class Recording:
+  def __init__(self, seed : int = 0, swept : bool = False, multiball : int = 0):
+    self.seed = seed
+    self.swept = swept
+    self.multiball = multiball
+    self.steps = bytearray() # every step, packed with REPLAY_STEP
+    self.last = -1 # where the last step starts in steps, if it can have more ticks added to it
+    # the state of the game when recording stopped
+    self.ticks = 0
+    self.score = 0
+    self.level = 1
+    self.lives = 3
+
+  # step a game, and record the input given to it.
+  # the game has to have been made with this recording's seed, swept and multiball settings.
+  def step(self, game : Game, paddle_x = None, launch : bool = False, ticks : int = 1) -> int:
+    if ticks > REPLAY_MAX_TICKS:
+      raise ValueError("too many ticks in one step to record")
+    if paddle_x is None and self.last >= 0:
+      # stepping a normal game n ticks is the same as stepping it once and then n-1 ticks with no input,
+      # so steps with no input are added on to the step before them
+      x, count = REPLAY_STEP.unpack_from(self.steps, self.last)
+      if (count & REPLAY_MAX_TICKS) + ticks <= REPLAY_MAX_TICKS:
+        REPLAY_STEP.pack_into(self.steps, self.last, x, count + ticks)
+        return self.finish(game, game.step(paddle_x, launch, ticks))
+    x = REPLAY_NO_PADDLE if paddle_x is None else max(-32767, min(32767, int(paddle_x)))
+    # swept steps move the ball all at once, so they can't be added on to
+    self.last = -1 if self.swept else len(self.steps)
+    self.steps += REPLAY_STEP.pack(x, ticks | (REPLAY_LAUNCH if launch else 0))
+    return self.finish(game, game.step(paddle_x, launch, ticks))
+
+  # keep track of the game's state after a step
+  def finish(self, game : Game, events : int) -> int:
+    self.ticks = game.ticks
+    self.score = game.score
+    self.level = game.level
+    self.lives = game.lives
+    return events
+
+  def save(self, filename : str) -> int:
+    try:
+      f = open(filename, "wb")
+    except OSError:
+      print("Error: Failed to open \"" + filename + "\".")
+      return Replay_Enum.OPEN_FILE
+    f.write(REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, REPLAY_SWEPT if self.swept else 0, self.seed,
+      self.multiball, self.ticks, self.score, self.level, self.lives))
+    f.write(self.steps)
+    f.close()
+    return Replay_Enum.OKAY
+
+  def load(self, filename : str) -> int:
+    try:
+      f = open(filename, "rb")
+    except OSError:
+      print("Error: Failed to open \"" + filename + "\".")
+      return Replay_Enum.OPEN_FILE
+    data = f.read()
+    f.close()
+    if len(data) < 5 or data[:4] != REPLAY_MAGIC:
+      print("Error: \"" + filename + "\" is not a valid recording.")
+      return Replay_Enum.INVALID_FILE
+    if data[4] != REPLAY_VERSION:
+      print("Error: \"" + filename + "\" is from a different version of the game.")
+      return Replay_Enum.INVALID_VERSION
+    if len(data) < REPLAY_HEADER.size or (len(data) - REPLAY_HEADER.size) % REPLAY_STEP.size != 0:
+      print("Error: \"" + filename + "\" is not a valid recording.")
+      return Replay_Enum.INVALID_FILE
+    magic, version, flags, self.seed, self.multiball, self.ticks, self.score, self.level, self.lives = REPLAY_HEADER.unpack_from(data)
+    self.swept = flags & REPLAY_SWEPT != 0
+    self.steps = bytearray(data[REPLAY_HEADER.size:])
+    self.last = -1
+    return Replay_Enum.OKAY
+
+  # play the recording back on a new game, as fast as possible. returns the game.
+  # levels has to be the same LevelPack the game was recorded with (None for the default levels).
+  def play(self, levels : LevelPack = None) -> Game:
+    game = Game(self.seed, self.swept, levels, self.multiball)
+    for x, count in REPLAY_STEP.iter_unpack(self.steps):
+      game.step(None if x == REPLAY_NO_PADDLE else x, count & REPLAY_LAUNCH != 0, count & REPLAY_MAX_TICKS)
+    return game
+
+  # play the recording back, and check that the game ends up where it did when it was recorded.
+  # returns a list of what didn't match, which is empty if everything did.
+  def verify(self, levels : LevelPack = None) -> list:
+    game = self.play(levels)
+    wrong = []
+    for name in ("ticks", "score", "level", "lives"):
+      if getattr(game, name) != getattr(self, name):
+        wrong.append("{}: recorded {}, played back {}".format(name, getattr(self, name), getattr(game, name)))
+    return wrong
+
+def main():
+  if len(sys.argv) < 2:
+    print("Error: Too few arguments.")
+    sys.exit(1)
+  recording = Recording()
+  if recording.load(sys.argv[1]) != Replay_Enum.OKAY:
+    sys.exit(1)
+  levels = load_levels(sys.argv[2] if len(sys.argv) > 2 else None)
+  if levels is None:
+    sys.exit(1)
+  start = _time.perf_counter()
+  wrong = recording.verify(levels)
+  elapsed = _time.perf_counter() - start
+  print("{} ticks in {:.3f}s ({:.0f} ticks/s)".format(recording.ticks, elapsed, recording.ticks/max(elapsed, 1e-9)))
+  print("level: {} lives: {} score: {}".format(recording.level, recording.lives, recording.score))
+  if wrong:
+    for line in wrong:
+      print("Mismatch: " + line)
+    sys.exit(Replay_Enum.MISMATCH)
+  print("playback matches the recording.")
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,124 @@
+#!/usr/bin/python3
+
+"""
+Copyright 2024 X Allegretta.
+
+This file is part of py3_bricksmasher.
+py3_bricksmasher is free software: you can redistribute it and/or modify it under the terms
+of the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+py3_bricksmasher is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+You should have received a copy of the GNU Lesser General Public License along with py3_bricksmasher.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# plays whole headless games on every core, and adds up the results.
+
+import concurrent.futures
+import os
+import random
+import sys
+import time as _time
+from game import *
+
+# play one game from start to finish.
+# the game ends when it's lost, when it's won, or after max_steps.
+# the paddle follows the ball, but is off by up to miss pixels, so games can be lost.
+# how far off it is gets picked again every time the ball goes back up.
+# everything random is seeded from seed, so the same seed always plays the same game.
+def run_episode(seed : int, max_steps : int = 1000000, miss : int = 130) -> dict:
+  random.seed(seed) # anything still using the global random module gets a known state too
+  rng = random.Random(seed)
+  game = Game(seed)
+  start = _time.perf_counter()
+  level = 1
+  score = 0
+  result = "timeout"
+  offset = 0
+  while game.ticks < max_steps:
+    score = game.score # losing resets the score, so a lost game keeps the one from before its last step
+    if game.ball_speed_y < 0:
+      offset = rng.randint(-miss, miss)
+    events = game.step(track_ball(game) + offset, True)
+    if events & Game_Enum.GAME_OVER:
+      result = "lost"
+      break
+    if events & Game_Enum.GAME_WON:
+      # winning puts the game back on level 1, but keeps the score
+      level = len(game.levels.levels)
+      score = game.score
+      result = "won"
+      break
+    level = max(level, game.level)
+  else:
+    score = game.score
+  return {
+    "seed": seed,
+    "result": result,
+    "score": score,
+    "level": level,
+    "steps": game.ticks,
+    "time": _time.perf_counter() - start,
+  }
+
+# run games for every seed on a pool of processes.
+# results are yielded as soon as each game finishes, in whatever order they finish in.
+def run_episodes(seeds, workers : int = None, max_steps : int = 1000000, miss : int = 130):
+  with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+    futures = [pool.submit(run_episode, seed, max_steps, miss) for seed in seeds]
+    for future in concurrent.futures.as_completed(futures):
+      yield future.result()
+
+# add up the results from a run
+class Summary:
+  def __init__(self):
+    self.games = 0
+    self.steps = 0
+    self.time = 0.0 # total time spent in games, across all workers
+    self.scores = []
+    self.levels = {} # level reached -> number of games
+    self.results = {} # "won"/"lost"/"timeout" -> number of games
+
+  def add(self, result : dict):
+    self.games += 1
+    self.steps += result["steps"]
+    self.time += result["time"]
+    self.scores.append(result["score"])
+    self.levels[result["level"]] = self.levels.get(result["level"], 0) + 1
+    self.results[result["result"]] = self.results.get(result["result"], 0) + 1
+
+  def report(self, wall_time : float) -> str:
+    scores = sorted(self.scores)
+    lines = []
+    lines.append("games: {} ({})".format(self.games, ", ".join("{} {}".format(v, k) for k, v in sorted(self.results.items()))))
+    if scores:
+      lines.append("score: min {} median {} mean {:.1f} max {}".format(
+        scores[0], scores[len(scores)//2], sum(scores)/len(scores), scores[-1]))
+    lines.append("level reached: " + ", ".join("{}: {}".format(k, v) for k, v in sorted(self.levels.items())))
+    lines.append("steps: {} in {:.2f}s ({:.0f} steps/s, {:.0f} steps/s per worker)".format(
+      self.steps, wall_time, self.steps/wall_time, self.steps/max(self.time, 1e-9)))
+    return "\n".join(lines)
+
+# usage: python3 runner.py [games] [workers] [first seed]
+def main():
+  games = 64
+  workers = os.cpu_count()
+  seed = 0
+  if len(sys.argv) > 1:
+    games = int(sys.argv[1])
+  if len(sys.argv) > 2:
+    workers = int(sys.argv[2])
+  if len(sys.argv) > 3:
+    seed = int(sys.argv[3])
+  summary = Summary()
+  start = _time.perf_counter()
+  for result in run_episodes(range(seed, seed+games), workers):
+    summary.add(result)
+    print("seed {:6}: {:7} level {} score {:6} in {} steps".format(
+      result["seed"], result["result"], result["level"], result["score"], result["steps"]))
+  print(summary.report(_time.perf_counter() - start))
+
+if __name__ == "__main__":
+  main()
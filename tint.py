@@ -0,0 +1,55 @@
+#!/usr/bin/python3
+
+"""
+Copyright 2024 X Allegretta.
+
+This file is part of py3_bricksmasher.
+py3_bricksmasher is free software: you can redistribute it and/or modify it under the terms
+of the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+py3_bricksmasher is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+You should have received a copy of the GNU Lesser General Public License along with py3_bricksmasher.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# colors images by multiplying every pixel by a color.
+
+import collections
+import os
+os.environ['PYGAME_HIDE_SUPPORT_PROMPT']="bluh." # disable pygame's welcome message.
+import pygame
+
+# the color used for a brick hue
+def hue_color(hue : int) -> pygame.Color:
+  col = pygame.Color(255, 255, 255)
+  col.hsla = (hue, 100, 80, 100)
+  return col
+
+# add a color effect to a surface.
+# SDL multiplies the red, green and blue of every pixel in one go. alpha is left alone.
+def set_color(surf : pygame.Surface, col : pygame.Color):
+  surf.fill(col, special_flags=pygame.BLEND_RGB_MULT)
+
+# keeps the most recently used colored copies of one image.
+class TintCache:
+  def __init__(self, surf : pygame.Surface, size : int = 32):
+    self.surf = surf
+    self.size = size # how many colored copies to keep
+    self.tints = collections.OrderedDict() # colored copies, stored by (r, g, b)
+
+  # get a copy of the image multiplied by a color
+  def get(self, col) -> pygame.Surface:
+    col = pygame.Color(col)
+    key = (col.r, col.g, col.b)
+    surf = self.tints.get(key)
+    if surf is None:
+      surf = self.surf.copy()
+      set_color(surf, col)
+      self.tints[key] = surf
+      if len(self.tints) > self.size:
+        self.tints.popitem(False)
+    else:
+      self.tints.move_to_end(key)
+    return surf
@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+
+"""
+Copyright 2024 X Allegretta.
+
+This file is part of py3_bricksmasher.
+py3_bricksmasher is free software: you can redistribute it and/or modify it under the terms
+of the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+py3_bricksmasher is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+You should have received a copy of the GNU Lesser General Public License along with py3_bricksmasher.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# fades from one screen to the next.
+# a copy of (part of) the old screen is drawn over each new frame, a little more see-through every time,
+# until it's gone.
+
+import time as _time
+import os
+os.environ['PYGAME_HIDE_SUPPORT_PROMPT']="bluh." # disable pygame's welcome message.
+import pygame
+
+class Fade:
+  # duration is how long the fade lasts, in seconds.
+  # clock gives the time in seconds. anything that counts up will do, like a game's ticks turned into seconds.
+  def __init__(self, duration : float = 4.25, clock = _time.perf_counter):
+    self.duration = duration
+    self.clock = clock
+    self.image = None # the old screen, or None if there's no fade going
+    self.rect = None # where the old screen is drawn
+    self.start_time = 0.0
+    self.alpha = 255
+
+  # start fading out what's on surf. if rect is given, only that part of it is faded. the rest changes right away.
+  def start(self, surf : pygame.Surface, rect : pygame.Rect = None):
+    self.rect = surf.get_rect() if rect is None else rect.clip(surf.get_rect())
+    image = surf.subsurface(self.rect)
+    # a copy in the display's format, without per-pixel alpha, is the fastest thing to blend
+    if pygame.display.get_surface() is not None:
+      self.image = image.convert()
+    else:
+      self.image = image.copy()
+    self.start_time = self.clock()
+    self.alpha = 255
+    self.image.set_alpha(None)
+
+  def stop(self):
+    self.image = None
+
+  def active(self) -> bool:
+    return self.image is not None
+
+  # draw the old screen over surf. returns where it was drawn, or None if the fade is over.
+  def draw(self, surf : pygame.Surface) -> pygame.Rect:
+    if self.image is None:
+      return None
+    alpha = int(255*(1 - (self.clock() - self.start_time)/self.duration))
+    if alpha <= 0:
+      # completely see-through, so there's nothing to draw
+      self.stop()
+      return None
+    alpha = min(alpha, 255)
+    if alpha != self.alpha:
+      self.alpha = alpha
+      # blending at 255 is much slower than a plain copy, and looks the same
+      self.image.set_alpha(alpha if alpha < 255 else None)
+    return surf.blit(self.image, self.rect)